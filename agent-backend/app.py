@@ -5,40 +5,184 @@ import json
 import time
 import threading
 from dotenv import load_dotenv
-from src.builder import builder
+from src.agent_state import initial_state
+from src.job_queue import JobQueue, QueueFull
+from src.stream_protocol import GraphEventStream
+from src.thread_ids import new_thread_id
+from src import metrics
 
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app)
 
-# Build graph
-try:
-    agent_builder = builder()
-    graph = agent_builder.build_graph()
-except Exception as e:
-    print(f"ERROR: Failed to initialize graph: {str(e)}")
-    print("Please check your environment variables:")
-    print("  - GOOGLE_APPLICATION_CREDENTIALS")
-    print("  - TAVILY_API_KEY")
-    raise
+# ------------------------------------------------------
+# Graph lifecycle (STARTUP_MODE=eager|lazy|background)
+#   eager      - build at import (errors stop the process)
+#   lazy       - build on the first request that needs it
+#   background - build in a warm-up thread right after import;
+#                /health answers at once, /ready once the graph is built
+# LangGraph/LangChain and provider packages are only imported by the build.
+# ------------------------------------------------------
+
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+
+agent_builder = None
+graph = None
+_graph_lock = threading.Lock()
+_graph_ready = threading.Event()
+_graph_error = None
+startup_timings = {}
+
+
+def _build_graph():
+    global agent_builder, graph, _graph_error
+
+    with _graph_lock:
+        if _graph_ready.is_set():
+            return
+        started = time.perf_counter()
+        profiler = None
+        if os.getenv("STARTUP_PROFILE", "false").lower() == "true":
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            from src.builder import builder
+            imported = time.perf_counter()
+            built = builder()
+            constructed = time.perf_counter()
+            compiled = built.build_graph()
+            built.retention.start()
+        except Exception as e:
+            _graph_error = e
+            print(f"ERROR: Failed to initialize graph: {str(e)}")
+            print("Please check your environment variables:")
+            print("  - GOOGLE_APPLICATION_CREDENTIALS")
+            print("  - TAVILY_API_KEY")
+            raise
+        finally:
+            if profiler is not None:
+                import pstats
+                profiler.disable()
+                pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+        agent_builder, graph, _graph_error = built, compiled, None
+        startup_timings.update({
+            "imports_s": round(imported - started, 3),
+            "clients_s": round(constructed - imported, 3),
+            "compile_s": round(time.perf_counter() - constructed, 3),
+            "total_s": round(time.perf_counter() - started, 3),
+        })
+        _graph_ready.set()
+        print(f"✅ Graph ready in {startup_timings['total_s']}s "
+              f"(imports {startup_timings['imports_s']}s, clients {startup_timings['clients_s']}s, "
+              f"compile {startup_timings['compile_s']}s)")
+
+
+def get_agent_builder():
+    """The graph builder (nodes, caches, checkpointer), built on first use if needed"""
+    if not _graph_ready.is_set():
+        _build_graph()
+    return agent_builder
+
+
+def get_graph():
+    """The compiled graph, built on first use if needed"""
+    get_agent_builder()
+    return graph
+
+
+def _warm_up():
+    try:
+        _build_graph()
+    except Exception:
+        # already logged; the next request retries the build
+        pass
+
+
+_warm_up_thread = None
+_warm_up_lock = threading.Lock()
+_forked = False
+
+
+def start_warm_up():
+    """Start the warm-up thread unless one is already running in this process"""
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _graph_ready.is_set() or (_warm_up_thread is not None and _warm_up_thread.is_alive()):
+            return
+        _warm_up_thread = threading.Thread(target=_warm_up, name="graph-warm-up", daemon=True)
+        _warm_up_thread.start()
+
+
+def _after_fork_in_child():
+    # only the forking thread survives a fork: a warm-up running in the parent
+    # is gone and may have left _graph_lock held. No thread in the child can
+    # hold the locks yet, so fresh ones are safe here.
+    global _graph_lock, _warm_up_lock, _warm_up_thread, _forked
+    _graph_lock = threading.Lock()
+    _warm_up_lock = threading.Lock()
+    _warm_up_thread = None
+    _forked = True
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+if STARTUP_MODE == "eager":
+    _build_graph()
+elif STARTUP_MODE == "background":
+    start_warm_up()
+
+# graceful draining: set when the server starts shutting down
+_draining = threading.Event()
+_streams_lock = threading.Lock()
+_active_streams = 0
+
+
+def on_worker_start():
+    """
+    Called in every forked server worker (see gunicorn.conf.py).
+    The graph and model clients were preloaded in the parent and are shared;
+    connections and background threads are re-created per worker.
+    """
+    if _graph_ready.is_set():
+        agent_builder.after_fork()
+        agent_builder.retention.start()
+    elif STARTUP_MODE == "background" and _forked:
+        # preloaded: the parent's warm-up thread did not survive the fork.
+        # Without preload the import in this worker already started one.
+        start_warm_up()
+
+
+def begin_drain():
+    """
+    Stop accepting new streams; in-flight NDJSON streams run to completion.
+    """
+    _draining.set()
+    print(f">> draining: {active_streams()} stream(s) in flight")
+
 
-# simple in-memory thread id generator
-_threads_lock = threading.Lock()
-_next_thread_id = 0
+def active_streams():
+    with _streams_lock:
+        return _active_streams
+
+
+def _track_stream(delta):
+    global _active_streams
+    with _streams_lock:
+        _active_streams += delta
 
 
 def new_thread_config():
     """
     Creates a new unique thread_id + timestamp (thread_ts)
     used by LangGraph checkpointer.
+    Thread IDs are ULIDs: unique across workers/replicas and time-sortable.
     """
-    global _next_thread_id
-    with _threads_lock:
-        tid = _next_thread_id
-        _next_thread_id += 1
-
-    return {"configurable": {"thread_id": str(tid), "thread_ts": str(time.time())}}, tid
+    tid = new_thread_id()
+    return {"configurable": {"thread_id": tid, "thread_ts": str(time.time())}}, tid
 
 
 def build_config(thread_id, thread_ts=None):
@@ -51,16 +195,19 @@ def build_config(thread_id, thread_ts=None):
     return cfg
 
 
-def run_agent_stream(graph, task, stop_after, start, max_iterations):
+# nodes whose chat model output is forwarded token by token
+STREAMED_NODES = {"planner", "generate", "reflect"}
+
+
+def _stream_start(task, start):
     """
-    Handles multi-step streaming execution across graph.
+    Resolve config, thread and first input for a stream run.
     """
-
     # new conversation (new thread)
     if start:
         config, thread_id = new_thread_config()
         thread_ts = config["configurable"]["thread_ts"]
-        input_payload = {"task": task}
+        input_payload = initial_state(task)
 
     # continuing old conversation
     else:
@@ -69,50 +216,156 @@ def run_agent_stream(graph, task, stop_after, start, max_iterations):
         config = build_config(thread_id, thread_ts)
         input_payload = {"task": task.get("task", "")}
 
-    partial = ""
+    return config, thread_id, thread_ts, input_payload
+
+
+def run_agent_stream(graph, task, stop_after, start, max_iterations):
+    """
+    Handles multi-step streaming execution across graph.
+    Yields token events ({"type": "token", "node", "chunk"}) while the model
+    generates, snapshot/delta events carrying only the state keys that changed
+    after each node (see StateDeltaEncoder), and a small state event after
+    every graph run. All events share one increasing "seq".
+    """
+    config, thread_id, thread_ts, input_payload = _stream_start(task, start)
+    events = GraphEventStream(thread_id, STREAMED_NODES, resolve=get_agent_builder().resolve_state)
 
     for _ in range(max_iterations):
         try:
-            response = graph.invoke(input_payload, config=config)
+            for mode, data in graph.stream(
+                input_payload,
+                config=config,
+                stream_mode=GraphEventStream.STREAM_MODES,
+            ):
+                event = events.translate(mode, data)
+                if event is not None:
+                    yield event
         except Exception as e:
             yield {"error": str(e)}
             return
 
-        partial += str(response) + "\n------------------\n\n"
+        get_agent_builder().retention.touch(thread_id)
 
         # extract runtime state
         try:
             state = graph.get_state(config)
-            lnode = state.values.get("lnode")
-            nnode = state.next
-            rev = state.values.get("revision_number")
-            count = state.values.get("count")
         except Exception:
-            lnode = None
-            nnode = None
-            rev = None
-            count = None
-
-        yield {
-            "partial": partial,
-            "thread_id": thread_id,
-            "thread_ts": thread_ts,
-            "lnode": lnode,
-            "nnode": nnode,
-            "revision_number": rev,
-            "count": count,
-        }
+            state = None
+
+        yield events.status(state, thread_ts)
+        nnode = getattr(state, "next", None)
 
         # next steps send empty input
         input_payload = {}
 
-        if not nnode or (stop_after and lnode in stop_after):
+        if not nnode or (stop_after and events.lnode in stop_after):
+            return
+
+
+async def arun_agent_stream(graph, task, stop_after, start, max_iterations):
+    """
+    Async variant of run_agent_stream (graph.astream); yields the same events.
+    """
+    config, thread_id, thread_ts, input_payload = _stream_start(task, start)
+    events = GraphEventStream(thread_id, STREAMED_NODES, resolve=get_agent_builder().resolve_state)
+
+    for _ in range(max_iterations):
+        try:
+            async for mode, data in graph.astream(
+                input_payload,
+                config=config,
+                stream_mode=GraphEventStream.STREAM_MODES,
+            ):
+                event = events.translate(mode, data)
+                if event is not None:
+                    yield event
+        except Exception as e:
+            yield {"error": str(e)}
+            return
+
+        get_agent_builder().retention.touch(thread_id)
+
+        try:
+            state = await graph.aget_state(config)
+        except Exception:
+            state = None
+
+        yield events.status(state, thread_ts)
+        nnode = getattr(state, "next", None)
+
+        input_payload = {}
+
+        if not nnode or (stop_after and events.lnode in stop_after):
             return
 
 
+def run_pipeline(graph, task, max_revisions=3):
+    """
+    Orchestrated run: executes the whole pipeline once on a new thread and
+    yields one {"type": "node"} event per finished node carrying only that
+    node's output (list keys only send items added by the node), then a
+    {"type": "done"} event with the final draft.
+    """
+    config, thread_id = new_thread_config()
+    payload = initial_state(task, max_revisions)
+    sent = {}
+    seq = 0
+
+    try:
+        for update in graph.stream(payload, config=config, stream_mode="updates"):
+            for node, output in update.items():
+                output = dict(output or {})
+                for key, value in output.items():
+                    if isinstance(value, list):
+                        output[key] = value[sent.get(key, 0):]
+                        sent[key] = len(value)
+                if "answers" in output:
+                    output["answers"] = get_agent_builder().resolve_answers(output["answers"])
+                yield {"type": "node", "thread_id": thread_id, "node": node, "output": output, "seq": seq}
+                seq += 1
+    except Exception as e:
+        yield {"error": str(e)}
+        return
+
+    get_agent_builder().retention.touch(thread_id)
+    values = graph.get_state(config).values or {}
+    yield {
+        "type": "done",
+        "thread_id": thread_id,
+        "draft": values.get("draft", ""),
+        "revision_number": values.get("revision_number"),
+        "seq": seq,
+    }
+
+
+def _ndjson_response(generator):
+    """
+    Stream a generator of events as NDJSON, tracked for graceful draining.
+    """
+    def stream():
+        _track_stream(1)
+        try:
+            for item in generator:
+                yield json.dumps(item) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            _track_stream(-1)
+
+    # disable proxy buffering so events reach the client immediately
+    return Response(
+        stream(),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/stream-run", methods=["POST"])
 def stream_run():
     try:
+        if _draining.is_set():
+            return jsonify({"error": "Server is shutting down, retry shortly"}), 503, {"Retry-After": "5"}
+
         if not request.json:
             return jsonify({"error": "Request body is required"}), 400
         
@@ -127,25 +380,132 @@ def stream_run():
             max_iterations = 2
 
         generator = run_agent_stream(
-            graph,
+            get_graph(),
             task,
             stop_after,
             start,
             max_iterations
         )
 
-        def stream():
-            try:
-                for item in generator:
-                    yield json.dumps(item) + "\n"
-            except Exception as e:
-                yield json.dumps({"error": str(e)}) + "\n"
-
-        return Response(stream(), mimetype="application/x-ndjson")
+        return _ndjson_response(generator)
     except Exception as e:
         return jsonify({"error": f"Failed to start stream: {str(e)}"}), 500
 
 
+@app.route("/api/run", methods=["POST"])
+def run():
+    try:
+        if _draining.is_set():
+            return jsonify({"error": "Server is shutting down, retry shortly"}), 503, {"Retry-After": "5"}
+
+        if not request.json:
+            return jsonify({"error": "Request body is required"}), 400
+
+        data = request.json
+        task = data.get("task")
+        if not task or not task.strip():
+            return jsonify({"error": "Task is required"}), 400
+
+        try:
+            max_revisions = int(data.get("max_revisions", 3))
+        except (ValueError, TypeError):
+            max_revisions = 3
+
+        return _ndjson_response(run_pipeline(get_graph(), task, max_revisions))
+    except Exception as e:
+        return jsonify({"error": f"Failed to start run: {str(e)}"}), 500
+
+
+# ------------------------------------------------------
+# Background jobs: plans run by worker.py, outside the web process
+# ------------------------------------------------------
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def job_queue():
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
+
+
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    try:
+        if not request.json:
+            return jsonify({"error": "Request body is required"}), 400
+
+        data = request.json
+        task = data.get("task")
+        if not task or not task.strip():
+            return jsonify({"error": "Task is required"}), 400
+
+        try:
+            max_revisions = int(data.get("max_revisions", 3))
+        except (ValueError, TypeError):
+            max_revisions = 3
+
+        tenant = request.headers.get("X-Tenant-ID") or data.get("tenant") or "default"
+
+        try:
+            job_id = job_queue().submit(task, tenant=tenant, max_revisions=max_revisions)
+        except QueueFull as e:
+            return jsonify({"error": str(e)}), 429, {"Retry-After": os.getenv("JOB_RETRY_AFTER", "30")}
+
+        return jsonify({"job_id": job_id, "status": "queued"}), 202
+    except Exception as e:
+        return jsonify({"error": f"Failed to submit job: {str(e)}"}), 500
+
+
+@app.route("/api/jobs", methods=["GET"])
+def job_stats():
+    try:
+        return jsonify(job_queue().stats())
+    except Exception as e:
+        return jsonify({"error": f"Failed to get job stats: {str(e)}"}), 500
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    try:
+        job = job_queue().get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({"error": f"Failed to get job: {str(e)}"}), 500
+
+
+@app.route("/api/jobs/<job_id>/events", methods=["GET"])
+def job_events(job_id):
+    """
+    NDJSON stream of a job's status and progress, one line per change,
+    ending with the finished job.
+    """
+    queue = job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+    def events():
+        last = None
+        while True:
+            job = queue.get(job_id)
+            current = (job["status"], json.dumps(job.get("progress")))
+            if current != last:
+                last = current
+                yield job
+            if job["status"] in ("done", "failed") or _draining.is_set():
+                return
+            time.sleep(poll_interval)
+
+    return _ndjson_response(events())
+
+
 @app.route("/api/get-state", methods=["GET"])
 def get_state():
     try:
@@ -155,10 +515,10 @@ def get_state():
 
         config = build_config(tid)
 
-        state = graph.get_state(config)
+        state = get_graph().get_state(config)
         
         return jsonify({
-            "values": getattr(state, "values", {}),
+            "values": get_agent_builder().resolve_state(getattr(state, "values", {})),
             "next": getattr(state, "next", None),
             "metadata": getattr(state, "metadata", {}),
             "config": getattr(state, "config", {}),
@@ -167,33 +527,124 @@ def get_state():
         return jsonify({"error": f"Failed to get state: {str(e)}"}), 500
 
 
+# ------------------------------------------------------
+# State history (newest first, cursor-paginated)
+#   limit  - checkpoints per page (STATE_HISTORY_PAGE_SIZE, default 50;
+#            capped at STATE_HISTORY_MAX_PAGE, default 500)
+#   before - thread_ts cursor; returns checkpoints older than it
+#   fields - comma-separated projection: summary fields and/or state keys
+# The limit and cursor are passed to the checkpointer, so SQL backends
+# read only the requested window.
+# ------------------------------------------------------
+
+HISTORY_SUMMARY_FIELDS = ("step", "lnode", "next", "revision_number", "count", "thread_ts")
+
+
+def _checkpoint_ts(cfg):
+    configurable = (cfg or {}).get("configurable", {})
+    return configurable.get("thread_ts") or configurable.get("checkpoint_id")
+
+
+def _history_params(args, default_limit):
+    """Parse limit/before/fields query args; raises ValueError on bad input"""
+    limit = args.get("limit", default_limit)
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("limit must be a positive integer")
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        limit = min(limit, int(os.getenv("STATE_HISTORY_MAX_PAGE", "500")))
+
+    fields = args.get("fields")
+    if fields:
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    return limit, args.get("before"), fields or list(HISTORY_SUMMARY_FIELDS)
+
+
+def _history_entry(snapshot, fields):
+    values = snapshot.values or {}
+    summary = {
+        "step": lambda: (snapshot.metadata or {}).get("step"),
+        "next": lambda: snapshot.next,
+        "thread_ts": lambda: _checkpoint_ts(snapshot.config),
+        "parent_ts": lambda: _checkpoint_ts(snapshot.parent_config),
+        "created_at": lambda: snapshot.created_at,
+    }
+    entry = {}
+    state_keys = []
+    for field in fields:
+        if field in summary:
+            entry[field] = summary[field]()
+        else:
+            state_keys.append(field)
+    if state_keys:
+        # only the projected values are resolved from the answer store
+        projected = {key: values.get(key) for key in state_keys}
+        entry.update(get_agent_builder().resolve_state(projected))
+    return entry
+
+
+def _history_snapshots(thread_id, limit, before):
+    before_config = None
+    if before:
+        before_config = {"configurable": {"thread_id": str(thread_id), "checkpoint_id": str(before)}}
+    return get_graph().get_state_history(build_config(thread_id), before=before_config, limit=limit)
+
+
 @app.route("/api/get-state-history", methods=["GET"])
 def get_state_history():
     try:
         tid = request.args.get("thread_id")
         if not tid:
             return jsonify({"error": "thread_id required"}), 400
-
-        config = build_config(tid)
-
-        history = []
-        for s in graph.get_state_history(config):
-            history.append({
-                "step": s.metadata.get("step"),
-                "lnode": s.values.get("lnode"),
-                "next": s.next,
-                "revision_number": s.values.get("revision_number"),
-                "count": s.values.get("count"),
-                "thread_ts": s.config.get("configurable", {}).get("thread_ts"),
-            })
-
-        return jsonify({"history": history})
+        try:
+            limit, before, fields = _history_params(
+                request.args, int(os.getenv("STATE_HISTORY_PAGE_SIZE", "50")))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # one extra checkpoint tells whether an older page exists
+        snapshots = list(_history_snapshots(tid, limit + 1, before))
+        page = snapshots[:limit]
+        history = [_history_entry(s, fields) for s in page]
+        next_before = _checkpoint_ts(page[-1].config) if len(snapshots) > limit else None
+
+        return jsonify({"history": history, "next_before": next_before})
     except Exception as e:
         return jsonify({"error": f"Failed to get state history: {str(e)}"}), 500
 
 
+@app.route("/api/get-state-history/stream", methods=["GET"])
+def stream_state_history():
+    """
+    NDJSON variant of get-state-history: one line per checkpoint, newest
+    first, then {"type": "done", "count": N}. limit is optional here;
+    without it the whole (remaining) history is streamed.
+    """
+    tid = request.args.get("thread_id")
+    if not tid:
+        return jsonify({"error": "thread_id required"}), 400
+    try:
+        limit, before, fields = _history_params(request.args, None)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def events():
+        count = 0
+        for snapshot in _history_snapshots(tid, limit, before):
+            yield {"type": "checkpoint", **_history_entry(snapshot, fields)}
+            count += 1
+        yield {"type": "done", "count": count}
+
+    return _ndjson_response(events())
+
+
 # ------------------------------------------------------
 # Atomic Step Endpoints (single-node invokes)
+# Each endpoint runs only its own node against the thread's
+# checkpoint (see builder.run_node), not the whole pipeline.
 # ------------------------------------------------------
 
 @app.route("/api/plan", methods=["POST"])
@@ -209,26 +660,14 @@ def plan():
             return jsonify({"error": "Task is required"}), 400
 
         config, tid = new_thread_config()
-        print(f">> invoking graph with task: {task[:50]}...")
-        
-        # Initialize state with defaults for TypedDict
-        initial_state = {
-            "task": task,
-            "plan": "",
-            "draft": "",
-            "critique": "",
-            "queries": [],
-            "answers": [],
-            "revision_number": 0,
-            "max_revisions": 3,
-            "count": 0
-        }
+        print(f">> running planner with task: {task[:50]}...")
         
         try:
-            result = graph.invoke(initial_state, config=config)
-            print(">> graph returned successfully")
+            result = get_agent_builder().run_node("planner", config, initial_state(task))
+            print(">> planner returned successfully")
+            get_agent_builder().retention.touch(tid)
         except Exception as graph_error:
-            print(f">> ERROR in graph.invoke: {str(graph_error)}")
+            print(f">> ERROR in planner: {str(graph_error)}")
             print(f">> Error type: {type(graph_error).__name__}")
             import traceback
             traceback.print_exc()
@@ -279,14 +718,15 @@ def research():
 
         config = build_config(thread_id)
 
-        result = graph.invoke({"plan": plan}, config=config)
+        result = get_agent_builder().run_node("research_plan", config, {"plan": plan})
+        get_agent_builder().retention.touch(thread_id)
         
         if not result:
             return jsonify({"error": "Failed to research plan"}), 500
             
         return jsonify({
             "queries": result.get("queries", []),
-            "answers": result.get("answers", []),
+            "answers": get_agent_builder().resolve_answers(result.get("answers", [])),
             "thread_id": thread_id
         })
     except Exception as e:
@@ -315,7 +755,8 @@ def generate():
 
         config = build_config(thread_id)
 
-        result = graph.invoke(data, config=config)
+        result = get_agent_builder().run_node("generate", config, {"task": task, "plan": plan})
+        get_agent_builder().retention.touch(thread_id)
         
         if not result:
             return jsonify({"error": "Failed to generate draft"}), 500
@@ -347,7 +788,8 @@ def critique():
 
         config = build_config(thread_id)
 
-        result = graph.invoke(data, config=config)
+        result = get_agent_builder().run_node("reflect", config, {"draft": draft})
+        get_agent_builder().retention.touch(thread_id)
         
         if not result:
             return jsonify({"error": "Failed to critique draft"}), 500
@@ -360,19 +802,64 @@ def critique():
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 
+@app.route("/api/cache-stats", methods=["GET"])
+def cache_stats():
+    search_cache = getattr(get_agent_builder(), "search_cache", None)
+    response_cache = getattr(get_agent_builder(), "response_cache", None)
+    return jsonify({
+        "search": search_cache.stats() if search_cache else None,
+        "llm": response_cache.stats() if response_cache else None,
+        "queries": get_agent_builder().query_index.stats(),
+        "answers": get_agent_builder().answer_store.stats() if get_agent_builder().answer_store else None,
+    })
+
+
+@app.route("/api/model-stats", methods=["GET"])
+def model_stats():
+    # rolling latency/error stats per provider when MODEL_ROUTING is set
+    stats = getattr(get_agent_builder().model, "stats", None)
+    return jsonify({"routing": stats() if callable(stats) else None})
+
+
 @app.route("/")
 def index():
     return jsonify({"service": "agent-backend", "status": "running"})
 
 
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    # per-process registry: scrape each worker, or run one worker per container
+    if not metrics.metrics_enabled():
+        return jsonify({"error": "Metrics are disabled (METRICS_ENABLED=false)"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route("/health")
 def health():
+    # report draining so load balancers stop routing new work here
+    if _draining.is_set():
+        return jsonify({"status": "draining", "active_streams": active_streams()}), 503
     return jsonify({"status": "ok"})
 
 
+@app.route("/ready")
+def ready():
+    # readiness: the graph is built (lazy mode builds on the first request, so it is always ready)
+    if _draining.is_set():
+        return jsonify({"status": "draining"}), 503
+    if _graph_ready.is_set():
+        return jsonify({"status": "ready", "startup_mode": STARTUP_MODE, "startup": startup_timings})
+    if _graph_error is not None:
+        return jsonify({"status": "failed", "error": str(_graph_error)}), 503
+    if STARTUP_MODE == "lazy":
+        return jsonify({"status": "ready", "startup_mode": STARTUP_MODE, "startup": None})
+    return jsonify({"status": "starting", "startup_mode": STARTUP_MODE}), 503
+
+
 if __name__ == "__main__":
+    # development server; use gunicorn -c gunicorn.conf.py wsgi:app in production
     app.run(
-        debug=True,
+        debug=os.getenv("FLASK_DEBUG", "true").lower() == "true",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 5000)),
         threaded=True
@@ -0,0 +1,197 @@
+"""
+ASGI entry point with async endpoints.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+/api/plan and /api/stream-run run the async node implementations, so a
+single process can hold hundreds of in-flight plans waiting on model and
+search I/O without a thread per request. Every other route is served by the
+Flask app in app.py.
+"""
+
+import json
+import asyncio
+import traceback
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Mount, Route
+
+import app as backend
+from app import (
+    app as flask_app,
+    arun_agent_stream,
+    initial_state,
+    new_thread_config,
+)
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+
+_async_graph_lock = asyncio.Lock()
+
+
+async def async_agent_builder():
+    """
+    The graph builder with its async graph compiled. With a lazy or
+    background STARTUP_MODE the sync build runs in a worker thread (or is
+    awaited if the warm-up thread is already on it) so the event loop keeps
+    serving /health meanwhile.
+    """
+    agent_builder = backend.agent_builder
+    if not backend._graph_ready.is_set():
+        agent_builder = await asyncio.to_thread(backend.get_agent_builder)
+    if getattr(agent_builder, "async_graph", None) is None:
+        async with _async_graph_lock:
+            if getattr(agent_builder, "async_graph", None) is None:
+                from src.checkpointer import create_async_checkpointer
+
+                # async checkpointers bind to the serving event loop
+                checkpointer = await create_async_checkpointer(agent_builder.memory)
+                agent_builder.build_async_graph(checkpointer)
+    return agent_builder
+
+
+async def _warm_up():
+    try:
+        await async_agent_builder()
+    except Exception:
+        # logged by the build; the first request retries it
+        pass
+
+
+async def _close_async_graph():
+    agent_builder = backend.agent_builder
+    async_graph = getattr(agent_builder, "async_graph", None)
+    if async_graph is None:
+        return
+    from src.checkpointer import close_async_checkpointer
+
+    async with _async_graph_lock:
+        agent_builder.async_graph = None
+        await close_async_checkpointer(async_graph.checkpointer, agent_builder.memory)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    warm_up = None
+    if backend.STARTUP_MODE == "eager":
+        await async_agent_builder()
+    elif backend.STARTUP_MODE == "background":
+        warm_up = asyncio.create_task(_warm_up())
+    yield
+    if warm_up is not None and not warm_up.done():
+        warm_up.cancel()
+    await _close_async_graph()
+
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except Exception:
+        return None
+
+
+async def plan(request):
+    try:
+        data = await _json_body(request)
+        if not data:
+            return JSONResponse({"error": "Request body is required"}, status_code=400)
+
+        task = data.get("task")
+        if not task or not task.strip():
+            return JSONResponse({"error": "Task is required"}, status_code=400)
+
+        agent_builder = await async_agent_builder()
+        config, tid = new_thread_config()
+        print(f">> running planner with task: {task[:50]}...")
+
+        try:
+            result = await agent_builder.arun_node("planner", config, initial_state(task))
+            agent_builder.retention.touch(tid)
+        except Exception as graph_error:
+            print(f">> ERROR in planner: {str(graph_error)}")
+            traceback.print_exc()
+            return JSONResponse({
+                "error": f"Graph execution failed: {str(graph_error)}",
+                "error_type": type(graph_error).__name__
+            }, status_code=500)
+
+        plan_result = (result or {}).get("plan", "")
+        if not plan_result:
+            return JSONResponse({"error": "Plan generation returned empty plan"}, status_code=500)
+
+        return JSONResponse({"plan": plan_result, "thread_id": tid})
+    except Exception as e:
+        traceback.print_exc()
+        return JSONResponse({
+            "error": f"Internal server error: {str(e)}",
+            "error_type": type(e).__name__
+        }, status_code=500)
+
+
+async def stream_run(request):
+    if backend._draining.is_set():
+        return JSONResponse(
+            {"error": "Server is shutting down, retry shortly"},
+            status_code=503,
+            headers={"Retry-After": "5"},
+        )
+
+    data = await _json_body(request)
+    if not data:
+        return JSONResponse({"error": "Request body is required"}, status_code=400)
+
+    try:
+        max_iterations = int(data.get("max_iterations", 2))
+    except (ValueError, TypeError):
+        max_iterations = 2
+
+    try:
+        agent_builder = await async_agent_builder()
+    except Exception as e:
+        return JSONResponse({"error": f"Failed to start stream: {str(e)}"}, status_code=500)
+
+    generator = arun_agent_stream(
+        agent_builder.async_graph,
+        data.get("task", ""),
+        data.get("stop_after", []),
+        data.get("start", True),
+        max_iterations,
+    )
+
+    async def stream():
+        backend._track_stream(1)
+        try:
+            async for item in generator:
+                yield json.dumps(item) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            backend._track_stream(-1)
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+app = Starlette(
+    routes=[
+        Route("/api/plan", plan, methods=["POST"]),
+        Route("/api/stream-run", stream_run, methods=["POST"]),
+        # everything else is served by the Flask app
+        Mount("/", app=WSGIMiddleware(flask_app)),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,360 @@
+"""
+Benchmarks - Offline pipeline benchmarks on the fake chat model and fake search
+
+Runs the real graph (nodes, checkpointer, answer store, stream protocol)
+against src/fake_providers.py, so results measure this code and not a
+provider. Run from agent-backend/:
+
+    python benchmarks/bench.py
+    python benchmarks/bench.py --concurrency 1,8,32 --revisions 1,3,5 --async
+    python benchmarks/bench.py --compare benchmarks/results/baseline.json
+
+Scenarios:
+  throughput  - full runs per (concurrency, max_revisions): runs/s, latency percentiles, node times
+  overhead    - runs with zero model/search latency: the pipeline's own cost per node
+  checkpoint  - latest checkpoint size and serialization time, and get_state latency
+  stream      - NDJSON stream encoding cost (delta events vs full snapshots)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+NODES = ("planner", "research_plan", "generate", "reflect", "research_critique")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the trip planner pipeline")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrent runs (default 1,4,16)")
+    parser.add_argument("--revisions", default="1,3", help="comma-separated max_revisions values (default 1,3)")
+    parser.add_argument("--runs-per-worker", type=int, default=2, help="runs per concurrent worker (default 2)")
+    parser.add_argument("--overhead-runs", type=int, default=20, help="runs for the zero-latency scenario")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="use graph.ainvoke instead of threads")
+    parser.add_argument("--model-latency-ms", type=float, default=50, help="fake model time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=200, help="fake model token rate (0 = instant)")
+    parser.add_argument("--response-tokens", type=int, default=200, help="tokens per fake model reply")
+    parser.add_argument("--search-latency-ms", type=float, default=100, help="fake search latency")
+    parser.add_argument("--result-chars", type=int, default=600, help="characters per fake search result")
+    parser.add_argument("--checkpointer", default="memory", help="CHECKPOINTER backend (default memory)")
+    parser.add_argument("--output", help="results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    return parser.parse_args()
+
+
+def configure(args):
+    """Point the app at the fake providers before any src module reads the environment"""
+    os.environ.update({
+        "MODEL_TYPE": "fake",
+        "MODEL_ROUTING": "",
+        "SEARCH_PROVIDER": "fake",
+        "FAKE_MODEL_LATENCY_MS": str(args.model_latency_ms),
+        "FAKE_MODEL_TOKENS_PER_SEC": str(args.tokens_per_sec),
+        "FAKE_MODEL_RESPONSE_TOKENS": str(args.response_tokens),
+        "FAKE_SEARCH_LATENCY_MS": str(args.search_latency_ms),
+        "FAKE_SEARCH_RESULT_CHARS": str(args.result_chars),
+        "CHECKPOINTER": args.checkpointer,
+        # every run does the same amount of work: no caches, no early exit
+        "SEARCH_CACHE_ENABLED": "false",
+        "LLM_CACHE_ENABLED": "false",
+        "QUERY_INDEX_GLOBAL": "false",
+        "SPECULATIVE_EXECUTION": "false",
+        "CONVERGENCE_ENABLED": "false",
+        "METRICS_ENABLED": "true",
+    })
+    # a per-node provider from .env would reach a real API
+    for node in NODES:
+        os.environ[f"{node.upper()}_MODEL_TYPE"] = "fake"
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def ms(seconds):
+    return round(seconds * 1000.0, 3) if seconds is not None else None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+class Bench:
+    def __init__(self, args):
+        from src.builder import builder
+        from src.agent_state import initial_state
+        from src.thread_ids import new_thread_id
+        from src import metrics
+
+        self.args = args
+        self.metrics = metrics
+        self.initial_state = initial_state
+        self.new_thread_id = new_thread_id
+        self.agent_builder = builder()
+        self.graph = self.agent_builder.build_graph()
+        self.async_graph = None
+        self.last_threads = {}  # max_revisions -> config of a finished run
+
+    # ---------------- helpers ----------------
+
+    def set_latency(self, model_ms, tokens_per_sec, search_ms):
+        models = {id(m): m for m in [self.agent_builder.model, *self.agent_builder.node_models.values()]}
+        for model in models.values():
+            model.latency_ms = model_ms
+            model.tokens_per_sec = tokens_per_sec
+        for client in (self.agent_builder.tavily, self.agent_builder.async_tavily):
+            client.latency_ms = search_ms
+
+    def node_totals(self):
+        totals = {}
+        for labels, count, total in self.metrics.NODE_SECONDS.totals():
+            totals[labels["node"]] = (count, total)
+        return totals
+
+    @staticmethod
+    def node_means(before, after):
+        means = {}
+        for node, (count, total) in after.items():
+            count0, total0 = before.get(node, (0, 0.0))
+            if count > count0:
+                means[node] = {"calls": count - count0, "mean_ms": ms((total - total0) / (count - count0))}
+        return means
+
+    def _config(self):
+        return {"configurable": {"thread_id": self.new_thread_id()}}
+
+    def run_once(self, max_revisions):
+        config = self._config()
+        started = time.perf_counter()
+        self.graph.invoke(self.initial_state("Plan a 3-day trip to Lisbon", max_revisions), config)
+        return time.perf_counter() - started, config
+
+    async def arun_once(self, max_revisions, semaphore):
+        async with semaphore:
+            config = self._config()
+            started = time.perf_counter()
+            await self.async_graph.ainvoke(self.initial_state("Plan a 3-day trip to Lisbon", max_revisions), config)
+            return time.perf_counter() - started, config
+
+    def run_batch(self, runs, concurrency, max_revisions):
+        if self.args.use_async:
+            async def batch():
+                if self.async_graph is None:
+                    from src.checkpointer import create_async_checkpointer
+                    self.agent_builder.build_async_graph(await create_async_checkpointer(self.agent_builder.memory))
+                    self.async_graph = self.agent_builder.async_graph
+                semaphore = asyncio.Semaphore(concurrency)
+                return await asyncio.gather(*(self.arun_once(max_revisions, semaphore) for _ in range(runs)))
+            return asyncio.run(batch())
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(lambda _: self.run_once(max_revisions), range(runs)))
+
+    # ---------------- scenarios ----------------
+
+    def throughput(self, concurrency_levels, revisions):
+        args = self.args
+        self.set_latency(args.model_latency_ms, args.tokens_per_sec, args.search_latency_ms)
+        results = []
+        for max_revisions in revisions:
+            for concurrency in concurrency_levels:
+                runs = concurrency * args.runs_per_worker
+                before = self.node_totals()
+                started = time.perf_counter()
+                outcomes = self.run_batch(runs, concurrency, max_revisions)
+                wall = time.perf_counter() - started
+                latencies = [latency for latency, _ in outcomes]
+                self.last_threads[max_revisions] = outcomes[-1][1]
+                result = {
+                    "concurrency": concurrency,
+                    "max_revisions": max_revisions,
+                    "runs": runs,
+                    "wall_s": round(wall, 3),
+                    "runs_per_s": round(runs / wall, 3),
+                    "latency_ms": {
+                        "p50": ms(percentile(latencies, 50)),
+                        "p95": ms(percentile(latencies, 95)),
+                        "max": ms(max(latencies)),
+                    },
+                    "nodes": self.node_means(before, self.node_totals()),
+                }
+                results.append(result)
+                print(f"  throughput c={concurrency:<3} rev={max_revisions}: "
+                      f"{result['runs_per_s']:8.2f} runs/s  p50 {result['latency_ms']['p50']:9.1f} ms  "
+                      f"p95 {result['latency_ms']['p95']:9.1f} ms")
+        return results
+
+    def overhead(self, max_revisions):
+        """Zero provider latency: whatever time remains is the pipeline's own"""
+        self.set_latency(0, 0, 0)
+        runs = self.args.overhead_runs
+        before = self.node_totals()
+        latencies = [latency for latency, _ in self.run_batch(runs, 1, max_revisions)]
+        nodes = self.node_means(before, self.node_totals())
+        run_mean = sum(latencies) / len(latencies)
+        node_time = sum(n["mean_ms"] * n["calls"] for n in nodes.values()) / runs
+        result = {
+            "max_revisions": max_revisions,
+            "runs": runs,
+            "run_mean_ms": ms(run_mean),
+            "nodes": nodes,
+            # checkpoint writes and LangGraph scheduling between nodes
+            "graph_overhead_ms": round(ms(run_mean) - node_time, 3),
+        }
+        print(f"  overhead rev={max_revisions}: {result['run_mean_ms']:.2f} ms/run, "
+              f"{result['graph_overhead_ms']:.2f} ms outside nodes")
+        return result
+
+    def checkpoint(self):
+        saver = self.agent_builder.memory
+        results = []
+        for max_revisions, config in sorted(self.last_threads.items()):
+            stored = saver.get_tuple(config)
+            checkpoint = stored.checkpoint
+            repeat = 50
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                _, data = saver.serde.dumps_typed(checkpoint)
+            serialize = (time.perf_counter() - started) / repeat
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                self.graph.get_state(config)
+            get_state = (time.perf_counter() - started) / repeat
+
+            values = checkpoint["channel_values"]
+            inline = {**checkpoint, "channel_values": self.agent_builder.resolve_state(values)}
+            _, inline_data = saver.serde.dumps_typed(inline)
+
+            result = {
+                "max_revisions": max_revisions,
+                "answers": len(values.get("answers") or []),
+                "checkpoint_bytes": len(data),
+                "checkpoint_bytes_answers_inline": len(inline_data),
+                "serialize_ms": ms(serialize),
+                "get_state_ms": ms(get_state),
+            }
+            results.append(result)
+            print(f"  checkpoint rev={max_revisions}: {result['checkpoint_bytes']} bytes "
+                  f"({result['checkpoint_bytes_answers_inline']} inline), "
+                  f"serialize {result['serialize_ms']:.3f} ms, get_state {result['get_state_ms']:.3f} ms")
+        return results
+
+    def stream(self, revisions):
+        from src.stream_protocol import GraphEventStream
+
+        self.set_latency(0, 0, 0)
+        results = []
+        for max_revisions in revisions:
+            items = list(self.graph.stream(
+                self.initial_state("Plan a 3-day trip to Lisbon", max_revisions),
+                self._config(),
+                stream_mode=GraphEventStream.STREAM_MODES,
+            ))
+            result = {"max_revisions": max_revisions, "items": len(items)}
+            for label, snapshot_every in (("delta", 0), ("snapshot", 1)):
+                repeat = 20
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    events = GraphEventStream("bench", {"generate"}, snapshot_every,
+                                              resolve=self.agent_builder.resolve_state)
+                    size = 0
+                    count = 0
+                    for mode, data in items:
+                        event = events.translate(mode, data)
+                        if event is not None:
+                            size += len(json.dumps(event)) + 1
+                            count += 1
+                elapsed = (time.perf_counter() - started) / repeat
+                result[label] = {
+                    "events": count,
+                    "bytes": size,
+                    "encode_ms": ms(elapsed),
+                    "us_per_event": round(elapsed * 1e6 / count, 2) if count else None,
+                }
+            results.append(result)
+            print(f"  stream rev={max_revisions}: delta {result['delta']['bytes']} bytes "
+                  f"in {result['delta']['encode_ms']:.2f} ms, snapshots {result['snapshot']['bytes']} bytes")
+        return results
+
+
+def compare(results, baseline_path):
+    """Print relative changes against an earlier results file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def change(new, old):
+        if not old or new is None:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_commit')}):")
+    old_cells = {(r["concurrency"], r["max_revisions"]): r for r in baseline.get("throughput", [])}
+    for r in results["throughput"]:
+        old = old_cells.get((r["concurrency"], r["max_revisions"]))
+        if old:
+            print(f"  throughput c={r['concurrency']:<3} rev={r['max_revisions']}: "
+                  f"runs/s {change(r['runs_per_s'], old['runs_per_s'])}, "
+                  f"p95 {change(r['latency_ms']['p95'], old['latency_ms']['p95'])}")
+    old_overhead = baseline.get("overhead") or {}
+    for node, stats in results["overhead"]["nodes"].items():
+        old = (old_overhead.get("nodes") or {}).get(node)
+        if old:
+            print(f"  overhead {node:<18} {change(stats['mean_ms'], old['mean_ms'])}")
+
+
+def main():
+    args = parse_args()
+    configure(args)
+    concurrency_levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    revisions = [int(r) for r in args.revisions.split(",") if r.strip()]
+
+    bench = Bench(args)
+    print(f"\nBenchmarking ({'async' if args.use_async else 'threads'}, {args.checkpointer} checkpointer)")
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+    }
+    results["throughput"] = bench.throughput(concurrency_levels, revisions)
+    results["overhead"] = bench.overhead(max(revisions))
+    results["checkpoint"] = bench.checkpoint()
+    results["stream"] = bench.stream(revisions)
+
+    output = args.output or os.path.join(
+        BACKEND_DIR, "benchmarks", "results",
+        datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S") + ".json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
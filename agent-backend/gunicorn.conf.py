@@ -0,0 +1,58 @@
+"""
+Gunicorn configuration for the agent backend.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+All settings can be overridden with environment variables.
+"""
+
+import os
+import signal
+import multiprocessing
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# gthread workers: each worker process serves several requests on threads,
+# which suits the long, I/O-bound plan and NDJSON stream requests
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# a full plan with revisions can take minutes
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
+# time in-flight NDJSON streams get to finish after SIGTERM
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "120"))
+
+# build the graph and model clients once in the master and share them via fork;
+# with STARTUP_MODE=lazy/background each worker boots fast and builds its own graph
+_eager = os.getenv("STARTUP_MODE", "eager").lower() == "eager"
+preload_app = os.getenv("GUNICORN_PRELOAD", "true" if _eager else "false").lower() == "true"
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def on_starting(server):
+    if workers > 1 and os.getenv("CHECKPOINTER", "memory").lower() == "memory":
+        server.log.warning(
+            "CHECKPOINTER=memory with %d workers: threads are only visible to the "
+            "worker that created them. Use sqlite/postgres/redis to share state.",
+            workers,
+        )
+
+
+def post_worker_init(worker):
+    import wsgi
+
+    wsgi.on_worker_start()
+
+    # start draining before gunicorn's own SIGTERM handling stops the worker
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _drain(signum, frame):
+        wsgi.begin_drain()
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, _drain)
@@ -15,6 +15,25 @@ class AgentState(TypedDict, total=False):
     revision_number: int
     max_revisions: int
     count: int
+    # similarity of the latest draft to the one before it (convergence check)
+    draft_similarity: float
+
+def initial_state(task, max_revisions=3):
+    """
+    Full initial AgentState for a new thread (TypedDict keys need defaults).
+    """
+    return {
+        "task": task,
+        "plan": "",
+        "draft": "",
+        "critique": "",
+        "queries": [],
+        "answers": [],
+        "revision_number": 0,
+        "max_revisions": max_revisions,
+        "count": 0,
+        "draft_similarity": 0.0
+    }
 
 class Queries(BaseModel):
     """
@@ -0,0 +1,219 @@
+"""
+Answer Store - Content-addressed storage for research answers kept out of checkpoints
+"""
+
+import os
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REF_PREFIX = "ans:"
+
+
+def answer_ref(text):
+    """Short content hash standing in for an answer in the graph state"""
+    return REF_PREFIX + hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+
+
+def is_ref(value):
+    return isinstance(value, str) and value.startswith(REF_PREFIX) and len(value) == len(REF_PREFIX) + 20
+
+
+class AnswerStore:
+    """
+    Keeps each distinct answer text once, keyed by its content hash, so
+    the graph state (and every checkpoint written after each node) only
+    carries ~24-character refs. Identical search results from different
+    queries, rounds or threads share one entry.
+
+    Answers are owned by the threads that stored them: release(thread_id)
+    (called when checkpoint retention deletes a thread) drops the thread's
+    answers that no other thread holds.
+
+    Without a path answers stay in process memory, capped at max_entries
+    (least recently used first; an evicted answer resolves as missing).
+    With a path, SQLite holds all answers and memory is an LRU tier in
+    front of it.
+    """
+
+    def __init__(self, path=None, max_entries=None):
+        """
+        path: SQLite file for stored answers (ANSWER_STORE_PATH, defaults to
+              CHECKPOINT_DB_PATH with the sqlite checkpointer, else memory only)
+        max_entries: answers kept in memory (ANSWER_STORE_CACHE_SIZE, default 5000)
+        """
+        if path is None:
+            path = os.getenv("ANSWER_STORE_PATH", "")
+            if not path and os.getenv("CHECKPOINTER", "memory").lower() == "sqlite":
+                path = os.getenv("CHECKPOINT_DB_PATH", "checkpoints.db")
+        self.path = path
+        self.max_entries = max_entries or int(os.getenv("ANSWER_STORE_CACHE_SIZE", "5000"))
+
+        self._entries = OrderedDict()  # ref -> text
+        # memory only: thread -> refs it stored, ref -> number of owning threads
+        self._threads = {}
+        self._owners = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self.stored = 0
+        self.deduplicated = 0
+        self.missing = 0
+        self.evicted = 0
+        self.released = 0
+
+        if self.path:
+            self._connect()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers (ref TEXT PRIMARY KEY, text TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answer_threads ("
+            "thread_id TEXT NOT NULL, ref TEXT NOT NULL, PRIMARY KEY (thread_id, ref))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS answer_threads_ref ON answer_threads (ref)")
+        self._db.commit()
+
+    def reopen(self):
+        """Open a fresh SQLite connection (connections must not cross a fork)"""
+        if self.path:
+            with self._lock:
+                self._connect()
+
+    def _remember(self, ref, text):
+        self._entries[ref] = text
+        self._entries.move_to_end(ref)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._db is None:
+                # memory only: the answer is gone for good
+                self._owners.pop(evicted, None)
+                self.evicted += 1
+
+    def _own(self, thread_id, refs):
+        if self._db is not None:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO answer_threads (thread_id, ref) VALUES (?, ?)",
+                [(thread_id, ref) for ref in refs],
+            )
+            return
+        owned = self._threads.setdefault(thread_id, set())
+        for ref in refs:
+            if ref not in owned:
+                owned.add(ref)
+                self._owners[ref] = self._owners.get(ref, 0) + 1
+
+    def put(self, texts, thread_id=None):
+        """
+        Store answer texts for `thread_id`; returns their refs in the same order.
+        Answers stored without a thread are only removed by the memory cap.
+        """
+        refs = []
+        new = []
+        with self._lock:
+            for text in texts:
+                ref = answer_ref(text)
+                refs.append(ref)
+                if ref in self._entries:
+                    self._entries.move_to_end(ref)
+                    self.deduplicated += 1
+                    continue
+                self._remember(ref, text)
+                new.append((ref, text))
+            if new and self._db is not None:
+                cursor = self._db.executemany(
+                    "INSERT OR IGNORE INTO answers (ref, text) VALUES (?, ?)", new
+                )
+                # rows already on disk were stored by an earlier run or another worker
+                self.deduplicated += len(new) - max(cursor.rowcount, 0)
+                self.stored += max(cursor.rowcount, 0)
+            else:
+                self.stored += len(new)
+            if thread_id is not None and refs:
+                self._own(str(thread_id), refs)
+            if self._db is not None:
+                self._db.commit()
+        return refs
+
+    def release(self, thread_id):
+        """
+        Drop a deleted thread's claim on its answers and delete the ones no
+        other thread holds. Returns the number of answers deleted.
+        """
+        thread_id = str(thread_id)
+        with self._lock:
+            if self._db is not None:
+                refs = [row[0] for row in self._db.execute(
+                    "SELECT ref FROM answer_threads WHERE thread_id = ?", (thread_id,)
+                )]
+                self._db.execute("DELETE FROM answer_threads WHERE thread_id = ?", (thread_id,))
+                orphans = [ref for ref in refs if self._db.execute(
+                    "SELECT 1 FROM answer_threads WHERE ref = ? LIMIT 1", (ref,)
+                ).fetchone() is None]
+                self._db.executemany("DELETE FROM answers WHERE ref = ?", [(ref,) for ref in orphans])
+                self._db.commit()
+            else:
+                orphans = []
+                for ref in self._threads.pop(thread_id, ()):
+                    remaining = self._owners.get(ref, 0) - 1
+                    if remaining > 0:
+                        self._owners[ref] = remaining
+                    else:
+                        self._owners.pop(ref, None)
+                        orphans.append(ref)
+            for ref in orphans:
+                self._entries.pop(ref, None)
+            self.released += len(orphans)
+            return len(orphans)
+
+    def get(self, ref):
+        """Answer text for `ref`, or None if it is unknown"""
+        with self._lock:
+            text = self._entries.get(ref)
+            if text is not None:
+                self._entries.move_to_end(ref)
+                return text
+            if self._db is not None:
+                row = self._db.execute("SELECT text FROM answers WHERE ref = ?", (ref,)).fetchone()
+                if row:
+                    self._remember(ref, row[0])
+                    return row[0]
+            self.missing += 1
+            return None
+
+    def resolve(self, answers):
+        """
+        Answer texts for a state's answers list. Plain texts (checkpoints
+        written before the store existed) pass through; unknown refs are dropped.
+        """
+        texts = []
+        for answer in answers or []:
+            if not is_ref(answer):
+                texts.append(answer)
+                continue
+            text = self.get(answer)
+            if text is None:
+                print(f"⚠️  Answer {answer} not found in the answer store")
+                continue
+            texts.append(text)
+        return texts
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "stored": self.stored,
+                "deduplicated": self.deduplicated,
+                "missing": self.missing,
+                "evicted": self.evicted,
+                "released": self.released,
+                "threads": len(self._threads),
+                "persistent": self._db is not None,
+            }
@@ -1,20 +1,34 @@
 from src.node_pipeline import NodePipeline
 from src.agent_state import AgentState
+from src import metrics
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableLambda
 
 
 class builder(NodePipeline):
     def __init__(self):
         super().__init__()
         self.builder = StateGraph(AgentState)
+        # node name -> (sync, async) implementation
+        self.nodes = {
+            "planner": (self.plan_node, self.aplan_node),
+            "research_plan": (self.research_plan_node, self.aresearch_plan_node),
+            "generate": (self.generation_node, self.ageneration_node),
+            "reflect": (self.reflection_node, self.areflection_node),
+            "research_critique": (self.research_critique_node, self.aresearch_critique_node),
+        }
+        if metrics.metrics_enabled():
+            self.nodes = {
+                name: (metrics.track_node(name, func), metrics.atrack_node(name, afunc))
+                for name, (func, afunc) in self.nodes.items()
+            }
 
     def build_graph(self):
 
-        self.builder.add_node("planner", self.plan_node)
-        self.builder.add_node("research_plan", self.research_plan_node)
-        self.builder.add_node("generate", self.generation_node)
-        self.builder.add_node("reflect", self.reflection_node)
-        self.builder.add_node("research_critique", self.research_critique_node)
+        # each node has a sync and an async implementation, so the same
+        # compiled graph serves both graph.invoke/stream and graph.ainvoke/astream
+        for name, (func, afunc) in self.nodes.items():
+            self.builder.add_node(name, RunnableLambda(func, afunc))
         self.builder.set_entry_point("planner")
         self.builder.add_conditional_edges(
             "generate", 
@@ -23,7 +37,11 @@ class builder(NodePipeline):
         )
         self.builder.add_edge("planner", "research_plan")
         self.builder.add_edge("research_plan", "generate")
-        self.builder.add_edge("reflect", "research_critique")
+        self.builder.add_conditional_edges(
+            "reflect",
+            self.should_research,
+            {END: END, "research_critique": "research_critique"}
+        )
         self.builder.add_edge("research_critique", "generate")
 
         self.graph = self.builder.compile(
@@ -32,3 +50,41 @@ class builder(NodePipeline):
 
         return self.graph
 
+    def build_async_graph(self, checkpointer):
+        """
+        Compile the same graph against an async-capable checkpointer
+        (see create_async_checkpointer) for graph.ainvoke/astream.
+        """
+        self.async_graph = self.builder.compile(
+            checkpointer=checkpointer,
+        )
+        return self.async_graph
+
+    def run_node(self, node, config, values=None, graph=None):
+        """
+        Execute exactly one node against a thread's checkpoint.
+        The node runs on the stored state merged with `values`; its output is
+        written back with update_state(as_node=node), so the checkpoint's
+        `next` follows the graph edges as if the node had run inside the graph.
+        Returns the thread state after the node.
+        """
+        graph = graph or self.graph
+        stored = graph.get_state(config).values or {}
+        state = {**stored, **(values or {})}
+        result = self.nodes[node][0](state, config)
+        graph.update_state(config, {**(values or {}), **result}, as_node=node)
+        return {**state, **result}
+
+    async def arun_node(self, node, config, values=None, graph=None):
+        """Async variant of run_node (defaults to the async graph)"""
+        graph = graph or self.async_graph
+        stored = (await graph.aget_state(config)).values or {}
+        state = {**stored, **(values or {})}
+        result = await self.nodes[node][1](state, config)
+        await graph.aupdate_state(config, {**(values or {}), **result}, as_node=node)
+        return {**state, **result}
+
+    def after_fork(self):
+        super().after_fork()
+        if getattr(self, "graph", None) is not None:
+            self.graph.checkpointer = self.memory
@@ -0,0 +1,138 @@
+"""
+Context Budget - Deduplicate, rank and pack research answers into a token budget
+"""
+
+import os
+import re
+import math
+from collections import Counter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def _terms(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _shingles(terms, size=3):
+    if len(terms) < size:
+        return {tuple(terms)}
+    return {tuple(terms[i:i + size]) for i in range(len(terms) - size + 1)}
+
+
+class ContextBudget:
+    """
+    Keeps prompt context constant in size no matter how many research
+    rounds have run:
+      1. drop exact and near-duplicate answers (word 3-gram Jaccard)
+      2. rank the rest with BM25 against the task/plan/critique
+      3. pack the top CONTEXT_TOP_K answers into CONTEXT_TOKEN_BUDGET tokens
+    """
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(self, token_budget=None, top_k=None, dedupe_threshold=None, max_queries=None):
+        """
+        token_budget: max estimated tokens of answers per prompt (CONTEXT_TOKEN_BUDGET, default 3000)
+        top_k: max answers per prompt (CONTEXT_TOP_K, default 12)
+        dedupe_threshold: Jaccard similarity above which answers are duplicates (CONTEXT_DEDUPE_THRESHOLD, default 0.8)
+        max_queries: most recent past queries shown to the critique researcher (CONTEXT_MAX_QUERIES, default 15)
+        """
+        self.token_budget = token_budget or int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+        self.top_k = top_k or int(os.getenv("CONTEXT_TOP_K", "12"))
+        self.dedupe_threshold = dedupe_threshold or float(os.getenv("CONTEXT_DEDUPE_THRESHOLD", "0.8"))
+        self.max_queries = max_queries or int(os.getenv("CONTEXT_MAX_QUERIES", "15"))
+
+    def dedupe(self, answers):
+        """Return answers without exact or near duplicates, first occurrence wins"""
+        kept = []
+        kept_shingles = []
+        seen = set()
+        for answer in answers:
+            if not answer:
+                continue
+            terms = _terms(answer)
+            normalized = " ".join(terms)
+            if normalized in seen:
+                continue
+            shingles = _shingles(terms)
+            if any(
+                len(shingles & other) / len(shingles | other) >= self.dedupe_threshold
+                for other in kept_shingles
+            ):
+                continue
+            seen.add(normalized)
+            kept.append(answer)
+            kept_shingles.append(shingles)
+        return kept
+
+    def rank(self, answers, query):
+        """Return answers sorted by BM25 score against `query` (stable for ties)"""
+        docs = [_terms(a) for a in answers]
+        if not docs:
+            return []
+        query_terms = set(_terms(query))
+        avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+        doc_freq = Counter(t for d in docs for t in set(d))
+        n = len(docs)
+
+        def score(doc):
+            tf = Counter(doc)
+            total = 0.0
+            for term in query_terms:
+                if term not in tf:
+                    continue
+                idf = math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                freq = tf[term]
+                total += idf * freq * (self.K1 + 1) / (
+                    freq + self.K1 * (1 - self.B + self.B * len(doc) / avg_len)
+                )
+            return total
+
+        scores = [score(d) for d in docs]
+        order = sorted(range(n), key=lambda i: -scores[i])
+        return [answers[i] for i in order]
+
+    def select(self, answers, *context):
+        """
+        Deduplicate and rank `answers` against the joined `context` strings,
+        then greedily pack the best ones into the token budget. An answer
+        larger than the whole budget is truncated rather than dropped.
+        """
+        ranked = self.rank(self.dedupe(answers or []), " ".join(c for c in context if c))
+        selected = []
+        remaining = self.token_budget
+        for answer in ranked[:self.top_k]:
+            cost = estimate_tokens(answer)
+            if cost <= remaining:
+                selected.append(answer)
+                remaining -= cost
+            elif not selected:
+                selected.append(answer[:self.token_budget * 4])
+                remaining = 0
+            if remaining <= 0:
+                break
+        return selected
+
+    def recent_queries(self, queries):
+        """Most recent distinct past queries, oldest first"""
+        recent = []
+        seen = set()
+        for query in reversed(queries or []):
+            key = " ".join(_terms(query))
+            if key in seen:
+                continue
+            seen.add(key)
+            recent.append(query)
+            if len(recent) >= self.max_queries:
+                break
+        return list(reversed(recent))
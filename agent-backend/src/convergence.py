@@ -0,0 +1,58 @@
+"""
+Convergence - Early exit from the revision loop when drafts stop changing or the critique approves
+"""
+
+import os
+import re
+from difflib import SequenceMatcher
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def draft_similarity(previous, draft):
+    """
+    Word-level similarity (0..1) between two drafts; 0.0 when there is no
+    previous draft to compare against.
+    """
+    if not previous or not draft:
+        return 0.0
+    return SequenceMatcher(None, previous.split(), draft.split()).ratio()
+
+
+class ConvergenceCheck:
+    """
+    Decides whether the revision loop can stop before max_revisions:
+      - after generate: the new draft is at least CONVERGENCE_SIMILARITY
+        similar to the previous one
+      - after reflect: the critique matches CONVERGENCE_APPROVAL_PATTERN
+        (the critique prompt asks for a final "VERDICT: APPROVED" line)
+    """
+
+    def __init__(self, enabled=None, similarity=None, approval_pattern=None):
+        """
+        enabled: CONVERGENCE_ENABLED (default true)
+        similarity: draft similarity that counts as converged (CONVERGENCE_SIMILARITY, default 0.9)
+        approval_pattern: regex for an approving critique (CONVERGENCE_APPROVAL_PATTERN)
+        """
+        if enabled is None:
+            enabled = os.getenv("CONVERGENCE_ENABLED", "true").lower() == "true"
+        self.enabled = enabled
+        self.similarity = similarity or float(os.getenv("CONVERGENCE_SIMILARITY", "0.9"))
+        self.approval = re.compile(
+            approval_pattern or os.getenv("CONVERGENCE_APPROVAL_PATTERN", r"VERDICT:\s*\**\s*APPROVED"),
+            re.IGNORECASE,
+        )
+
+    def draft_converged(self, state):
+        """Return the exit reason if successive drafts barely changed, else None"""
+        similarity = state.get("draft_similarity") or 0.0
+        if self.enabled and similarity >= self.similarity:
+            return f"draft converged (similarity {similarity:.2f} >= {self.similarity:.2f})"
+        return None
+
+    def critique_approved(self, state):
+        """Return the exit reason if the critique approves the draft, else None"""
+        if self.enabled and self.approval.search(state.get("critique") or ""):
+            return "critique approved the draft"
+        return None
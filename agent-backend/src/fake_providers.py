@@ -0,0 +1,176 @@
+"""
+Fake Providers - Deterministic offline stand-ins for the chat model and Tavily (benchmarks)
+"""
+
+import os
+import time
+import random
+import asyncio
+import hashlib
+from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+load_dotenv()
+
+_WORDS = (
+    "day morning afternoon evening museum walk tour market cafe lunch dinner "
+    "station train metro ticket hotel check-in river bridge old town square "
+    "cathedral gallery park garden viewpoint sunset beach hike trail castle "
+    "palace harbor ferry bus budget reservation local dish street food wine "
+    "tasting festival neighborhood shopping souvenir rest break transfer "
+    "airport flight luggage guide booking weather jacket umbrella map"
+).split()
+
+_PLACES = ("paris", "rome", "kyoto", "lisbon", "prague", "vienna", "seoul", "cusco")
+_TOPICS = (
+    "weather october", "opening hours", "ticket prices", "best neighborhoods",
+    "local food", "day trips", "public transport", "festivals", "hiking trails",
+    "museum passes", "safety tips", "budget hotels",
+)
+
+
+def _rng(*parts):
+    seed = hashlib.sha256("\x1f".join(parts).encode("utf-8")).digest()
+    return random.Random(seed)
+
+
+def _prompt_text(messages):
+    return "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that answers without a network call. Replies are derived
+    from a hash of the prompt, so the same prompt always gets the same reply
+    and different prompts get different replies. Each call sleeps for
+    latency_ms plus response_tokens / tokens_per_sec, and streamed
+    tokens arrive at tokens_per_sec.
+    with_structured_output() returns Queries-like objects with
+    queries_per_call search queries.
+    """
+
+    latency_ms: float = 50.0
+    tokens_per_sec: float = 200.0
+    response_tokens: int = 200
+    queries_per_call: int = 3
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    def _reply(self, messages):
+        rng = _rng(_prompt_text(messages))
+        return " ".join(rng.choice(_WORDS) for _ in range(self.response_tokens))
+
+    def _token_delay(self):
+        return 1.0 / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0
+
+    def _message(self, messages, text):
+        prompt_tokens = len(_prompt_text(messages)) // 4
+        output_tokens = len(text.split())
+        return AIMessage(content=text, usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": prompt_tokens + output_tokens,
+        })
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = self._reply(messages)
+        time.sleep(self.latency_ms / 1000.0 + self.response_tokens * self._token_delay())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, text))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = self._reply(messages)
+        await asyncio.sleep(self.latency_ms / 1000.0 + self.response_tokens * self._token_delay())
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, text))])
+
+    def _chunks(self, messages):
+        tokens = self._reply(messages).split(" ")
+        for i, token in enumerate(tokens):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token if i == 0 else " " + token))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency_ms / 1000.0)
+        delay = self._token_delay()
+        for chunk in self._chunks(messages):
+            if delay:
+                time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        delay = self._token_delay()
+        for chunk in self._chunks(messages):
+            if delay:
+                await asyncio.sleep(delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    def _queries(self, messages):
+        rng = _rng("queries", _prompt_text(messages))
+        return [f"{rng.choice(_PLACES)} {rng.choice(_TOPICS)}" for _ in range(self.queries_per_call)]
+
+    def with_structured_output(self, schema, **kwargs):
+        # a structured reply is about as long as a few queries
+        delay = self.latency_ms / 1000.0 + 10 * self.queries_per_call * self._token_delay()
+
+        def structured(messages):
+            time.sleep(delay)
+            return schema(queries=self._queries(messages))
+
+        async def astructured(messages):
+            await asyncio.sleep(delay)
+            return schema(queries=self._queries(messages))
+
+        return RunnableLambda(structured, astructured)
+
+
+class FakeSearchClient:
+    """
+    TavilyClient stand-in: search() sleeps latency_ms and returns
+    max_results deterministic results of result_chars characters each.
+    """
+
+    def __init__(self, latency_ms=None, result_chars=None):
+        """
+        latency_ms: delay per search (FAKE_SEARCH_LATENCY_MS, default 100)
+        result_chars: content length per result (FAKE_SEARCH_RESULT_CHARS, default 600)
+        """
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.getenv("FAKE_SEARCH_LATENCY_MS", "100"))
+        self.result_chars = result_chars or int(os.getenv("FAKE_SEARCH_RESULT_CHARS", "600"))
+
+    def _response(self, query, max_results):
+        results = []
+        for rank in range(max_results):
+            rng = _rng("search", query, str(rank))
+            words = []
+            length = 0
+            while length < self.result_chars:
+                word = rng.choice(_WORDS)
+                words.append(word)
+                length += len(word) + 1
+            results.append({
+                "title": f"{query} ({rank + 1})",
+                "url": f"https://example.com/{rank}",
+                "content": " ".join(words)[:self.result_chars],
+                "score": 1.0 - rank / 10.0,
+            })
+        return {"query": query, "results": results}
+
+    def search(self, query, max_results=5, **kwargs):
+        time.sleep(self.latency_ms / 1000.0)
+        return self._response(query, max_results)
+
+
+class AsyncFakeSearchClient(FakeSearchClient):
+    """AsyncTavilyClient stand-in"""
+
+    async def search(self, query, max_results=5, **kwargs):
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        return self._response(query, max_results)
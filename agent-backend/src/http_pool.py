@@ -0,0 +1,135 @@
+"""
+HTTP Pool - Shared, tunable HTTP connection pools per provider
+"""
+
+import os
+import time
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_lock = threading.Lock()
+_clients = {}        # provider -> httpx.Client
+_async_clients = {}  # provider -> httpx.AsyncClient
+_sessions = {}       # provider -> requests.Session
+_probes = {}         # url -> (checked_at, result)
+
+
+def _http2_enabled():
+    if os.getenv("HTTP2_ENABLED", "true").lower() != "true":
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def _timeout():
+    import httpx
+
+    return httpx.Timeout(
+        float(os.getenv("HTTP_TIMEOUT", "120")),
+        connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", "10")),
+    )
+
+
+def client_kwargs(http2=True):
+    """
+    Keyword arguments for an httpx client using the shared pool settings
+    (HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY,
+    HTTP_TIMEOUT, HTTP2_ENABLED). HTTP/2 needs the h2 package and TLS.
+    """
+    return {
+        "limits": _limits(),
+        "timeout": _timeout(),
+        "http2": http2 and _http2_enabled(),
+    }
+
+
+def http_client(provider, http2=True):
+    """Shared httpx.Client for `provider` (keep-alive pool reused by every model)"""
+    import httpx
+
+    with _lock:
+        if provider not in _clients:
+            _clients[provider] = httpx.Client(**client_kwargs(http2))
+        return _clients[provider]
+
+
+def async_http_client(provider, http2=True):
+    """Shared httpx.AsyncClient for `provider`"""
+    import httpx
+
+    with _lock:
+        if provider not in _async_clients:
+            _async_clients[provider] = httpx.AsyncClient(**client_kwargs(http2))
+        return _async_clients[provider]
+
+
+def requests_session(provider):
+    """Shared requests.Session for `provider`, for clients built on requests (Tavily)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _lock:
+        if provider not in _sessions:
+            size = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=size)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+        return _sessions[provider]
+
+
+def probe(url, ttl=None):
+    """
+    GET `url` once and cache the outcome for HTTP_PROBE_TTL seconds
+    (default 60). Returns the decoded JSON body; raises ConnectionError
+    (also cached) when the service is unreachable or not healthy.
+    """
+    import httpx
+
+    ttl = ttl if ttl is not None else float(os.getenv("HTTP_PROBE_TTL", "60"))
+    cached = _probes.get(url)
+    if cached and time.time() - cached[0] < ttl:
+        result = cached[1]
+    else:
+        try:
+            # a one-off request: no pooled socket is left open across a fork
+            response = httpx.get(url, timeout=2)
+            if response.status_code != 200:
+                raise ConnectionError(f"{url} returned HTTP {response.status_code}")
+            result = response.json()
+        except Exception as e:
+            result = e if isinstance(e, ConnectionError) else ConnectionError(str(e))
+        _probes[url] = (time.time(), result)
+
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def after_fork():
+    """
+    Drop pooled connections inherited from the parent process. Clients stay
+    usable (and shared by the models holding them); they reconnect lazily.
+    Async clients are only used under uvicorn, which does not fork after import.
+    """
+    with _lock:
+        for client in _clients.values():
+            client._transport.close()
+        for session in _sessions.values():
+            session.close()
@@ -0,0 +1,163 @@
+"""
+Job Queue - SQLite-backed queue for long-running plans run by worker processes
+"""
+
+import os
+import json
+import time
+import sqlite3
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+from src.thread_ids import new_thread_id
+
+load_dotenv()
+
+
+class QueueFull(Exception):
+    """Raised by submit() when the queue is at capacity (maps to HTTP 429)"""
+
+
+class JobQueue:
+    """
+    Durable job queue shared by the web process (submit/get) and the
+    worker processes (claim/progress/complete/fail) through one SQLite file.
+
+    Jobs move queued -> running -> done | failed. claim() takes the oldest
+    queued job whose tenant has fewer than JOB_TENANT_MAX_CONCURRENCY jobs
+    running, so one tenant cannot occupy the whole worker pool.
+    """
+
+    def __init__(self, path=None, max_pending=None, tenant_limit=None, stale_after=None):
+        """
+        path: SQLite file shared by web and workers (JOB_QUEUE_PATH, default jobs.db)
+        max_pending: queued jobs accepted before submit() raises QueueFull (JOB_QUEUE_MAX_PENDING, default 100)
+        tenant_limit: running jobs per tenant (JOB_TENANT_MAX_CONCURRENCY, default 2)
+        stale_after: seconds without progress before a running job is requeued (JOB_STALE_AFTER, default 600)
+        """
+        self.path = path or os.getenv("JOB_QUEUE_PATH", "jobs.db")
+        self.max_pending = max_pending or int(os.getenv("JOB_QUEUE_MAX_PENDING", "100"))
+        self.tenant_limit = tenant_limit or int(os.getenv("JOB_TENANT_MAX_CONCURRENCY", "2"))
+        self.stale_after = stale_after or float(os.getenv("JOB_STALE_AFTER", "600"))
+
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, tenant TEXT NOT NULL, task TEXT NOT NULL, "
+                "max_revisions INTEGER NOT NULL, status TEXT NOT NULL, "
+                "progress TEXT, result TEXT, error TEXT, worker TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, finished_at REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    @contextmanager
+    def _connect(self):
+        # short-lived connections: safe across threads and forked processes
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def submit(self, task, tenant="default", max_revisions=3):
+        """Queue a task and return its job ID; raises QueueFull at capacity"""
+        job_id = new_thread_id()
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            pending = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if pending >= self.max_pending:
+                db.execute("ROLLBACK")
+                raise QueueFull(f"Job queue is full ({pending} pending)")
+            db.execute(
+                "INSERT INTO jobs (id, tenant, task, max_revisions, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, tenant, task, max_revisions, now, now),
+            )
+            db.execute("COMMIT")
+        return job_id
+
+    def claim(self, worker):
+        """Atomically take the next runnable job for `worker`, or return None"""
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT * FROM jobs q WHERE q.status = 'queued' AND ("
+                "SELECT COUNT(*) FROM jobs r WHERE r.status = 'running' AND r.tenant = q.tenant"
+                ") < ? ORDER BY q.id LIMIT 1",
+                (self.tenant_limit,),
+            ).fetchone()
+            if row is None:
+                db.execute("ROLLBACK")
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, updated_at = ? WHERE id = ?",
+                (worker, now, row["id"]),
+            )
+            db.execute("COMMIT")
+        job = self._to_dict(row)
+        job.update({"status": "running", "worker": worker})
+        return job
+
+    def progress(self, job_id, progress):
+        """Record progress (e.g. last node, revision) and refresh the heartbeat"""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(progress), time.time(), job_id),
+            )
+
+    def complete(self, job_id, result):
+        self._finish(job_id, "done", result=json.dumps(result))
+
+    def fail(self, job_id, error):
+        self._finish(job_id, "failed", error=str(error))
+
+    def _finish(self, job_id, status, result=None, error=None):
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, finished_at = ? "
+                "WHERE id = ?",
+                (status, result, error, now, now, job_id),
+            )
+
+    def requeue_stale(self):
+        """Put running jobs whose worker stopped reporting back in the queue"""
+        cutoff = time.time() - self.stale_after
+        with self._connect() as db:
+            cur = db.execute(
+                "UPDATE jobs SET status = 'queued', worker = NULL "
+                "WHERE status = 'running' AND updated_at < ?",
+                (cutoff,),
+            )
+            return cur.rowcount
+
+    def get(self, job_id):
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def stats(self):
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: n for status, n in rows}
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "max_pending": self.max_pending,
+            "tenant_limit": self.tenant_limit,
+        }
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        for key in ("progress", "result"):
+            if job.get(key):
+                job[key] = json.loads(job[key])
+        return job
@@ -0,0 +1,307 @@
+"""
+Metrics - In-process counters and histograms exported in the Prometheus text format
+"""
+
+import os
+import json
+import time
+import bisect
+import functools
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# seconds: spans cached searches (ms) up to slow multi-revision generations
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+
+def metrics_enabled():
+    return os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_number(value)}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # labels -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def totals(self):
+        """[(labels dict, count, sum)] per label combination"""
+        with self._lock:
+            return [
+                (dict(zip(self.labelnames, key)), sum(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _label_text(self.labelnames, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labelnames=(), buckets=DURATION_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+NODE_SECONDS = REGISTRY.histogram(
+    "agent_node_duration_seconds", "Wall time of graph nodes", ["node"])
+NODE_ERRORS = REGISTRY.counter(
+    "agent_node_errors_total", "Graph node failures", ["node"])
+
+LLM_SECONDS = REGISTRY.histogram(
+    "agent_llm_duration_seconds", "Wall time of chat model calls", ["node", "provider", "call"])
+LLM_ERRORS = REGISTRY.counter(
+    "agent_llm_errors_total", "Failed chat model calls", ["node", "provider", "call"])
+LLM_TOKENS = REGISTRY.counter(
+    "agent_llm_tokens_total", "Chat model tokens (provider-reported, else estimated)", ["node", "provider", "type"])
+LLM_BYTES = REGISTRY.counter(
+    "agent_llm_payload_bytes_total", "Chat model prompt and response text bytes", ["node", "provider", "direction"])
+LLM_RETRIES = REGISTRY.counter(
+    "agent_llm_retries_total", "Extra provider requests (routing fallbacks and hedges)", ["provider", "reason"])
+PROVIDER_SECONDS = REGISTRY.histogram(
+    "agent_provider_duration_seconds", "Wall time of requests to each routed provider", ["provider"])
+
+SEARCH_SECONDS = REGISTRY.histogram(
+    "agent_search_duration_seconds", "Wall time of single search queries", ["node", "provider"])
+SEARCH_ERRORS = REGISTRY.counter(
+    "agent_search_errors_total", "Failed or timed-out search queries", ["node", "provider", "reason"])
+SEARCH_BYTES = REGISTRY.counter(
+    "agent_search_result_bytes_total", "Text bytes of search result contents", ["node", "provider"])
+
+
+def render():
+    return REGISTRY.render()
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation helpers
+# ---------------------------------------------------------------------------
+
+def track_node(name, func):
+    """Wrap a sync node function so its wall time and failures are recorded"""
+    @functools.wraps(func)
+    def node(state, config=None):
+        started = time.perf_counter()
+        try:
+            return func(state, config)
+        except Exception:
+            NODE_ERRORS.inc(node=name)
+            raise
+        finally:
+            NODE_SECONDS.observe(time.perf_counter() - started, node=name)
+
+    return node
+
+
+def atrack_node(name, func):
+    """Async variant of track_node"""
+    @functools.wraps(func)
+    async def node(state, config=None):
+        started = time.perf_counter()
+        try:
+            return await func(state, config)
+        except Exception:
+            NODE_ERRORS.inc(node=name)
+            raise
+        finally:
+            NODE_SECONDS.observe(time.perf_counter() - started, node=name)
+
+    return node
+
+
+def _text_bytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, list):
+        return sum(_text_bytes(v) for v in value)
+    content = getattr(value, "content", None)
+    if content is not None:
+        return _text_bytes(content)
+    if hasattr(value, "model_dump"):
+        return len(json.dumps(value.model_dump()).encode("utf-8"))
+    if isinstance(value, dict):
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    return len(str(value).encode("utf-8"))
+
+
+class InstrumentedChatModel:
+    """
+    Wraps a node's chat model (or a structured-output runnable derived from
+    it) and records wall time, tokens and payload bytes of every
+    invoke/ainvoke/stream/astream, labeled by node and provider.
+    Token counts come from the response's usage_metadata when the provider
+    reports it, otherwise they are estimated at ~4 bytes per token.
+    """
+
+    def __init__(self, model, node, provider, call="invoke"):
+        self.model = model
+        self.node = node
+        self.provider = provider
+        self.call = call
+
+    def _labels(self, call=None):
+        return {"node": self.node, "provider": self.provider, "call": call or self.call}
+
+    def _record(self, call, started, messages, resp, error=None):
+        labels = self._labels(call)
+        LLM_SECONDS.observe(time.perf_counter() - started, **labels)
+        if error is not None:
+            LLM_ERRORS.inc(**labels)
+            return
+
+        sent = _text_bytes(messages)
+        received = _text_bytes(resp)
+        usage = getattr(resp, "usage_metadata", None) or {}
+        prompt_tokens = usage.get("input_tokens") or sent // 4
+        completion_tokens = usage.get("output_tokens") or received // 4
+        node, provider = labels["node"], labels["provider"]
+        LLM_BYTES.inc(sent, node=node, provider=provider, direction="request")
+        LLM_BYTES.inc(received, node=node, provider=provider, direction="response")
+        LLM_TOKENS.inc(prompt_tokens, node=node, provider=provider, type="prompt")
+        LLM_TOKENS.inc(completion_tokens, node=node, provider=provider, type="completion")
+
+    def invoke(self, messages, config=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            resp = self.model.invoke(messages, config, **kwargs)
+        except Exception as e:
+            self._record(self.call, started, messages, None, e)
+            raise
+        self._record(self.call, started, messages, resp)
+        return resp
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            resp = await self.model.ainvoke(messages, config, **kwargs)
+        except Exception as e:
+            self._record(self.call, started, messages, None, e)
+            raise
+        self._record(self.call, started, messages, resp)
+        return resp
+
+    def stream(self, messages, config=None, **kwargs):
+        started = time.perf_counter()
+        text = ""
+        try:
+            for chunk in self.model.stream(messages, config, **kwargs):
+                content = getattr(chunk, "content", "")
+                text += content if isinstance(content, str) else ""
+                yield chunk
+        except Exception as e:
+            self._record("stream", started, messages, None, e)
+            raise
+        self._record("stream", started, messages, text)
+
+    async def astream(self, messages, config=None, **kwargs):
+        started = time.perf_counter()
+        text = ""
+        try:
+            async for chunk in self.model.astream(messages, config, **kwargs):
+                content = getattr(chunk, "content", "")
+                text += content if isinstance(content, str) else ""
+                yield chunk
+        except Exception as e:
+            self._record("stream", started, messages, None, e)
+            raise
+        self._record("stream", started, messages, text)
+
+    def with_structured_output(self, schema, **kwargs):
+        return InstrumentedChatModel(
+            self.model.with_structured_output(schema, **kwargs), self.node, self.provider, "structured"
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
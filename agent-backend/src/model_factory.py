@@ -6,83 +6,205 @@ import os
 from dotenv import load_dotenv
 from langchain_core.messages import SystemMessage, HumanMessage
 
+from src import http_pool
+from src.model_router import RoutingChatModel
+
 load_dotenv()
 
 class ModelFactory:
     """Factory to create chat models from different providers"""
     
     @staticmethod
-    def create_model():
+    def create_model(temperature=0.7, max_tokens=None):
         """
         Create a chat model based on MODEL_TYPE environment variable
-        Returns a LangChain-compatible chat model
+        Returns a LangChain-compatible chat model.
+        With MODEL_ROUTING=provider1,provider2,... a RoutingChatModel over
+        those providers is returned instead (see src/model_router.py).
         """
-        model_type = os.getenv("MODEL_TYPE", "ollama").lower()
-        
+        routing = [p.strip().lower() for p in os.getenv("MODEL_ROUTING", "").split(",") if p.strip()]
+        if routing:
+            return ModelFactory._create_routing_model(routing, temperature=temperature, max_tokens=max_tokens)
+        return ModelFactory.create_provider_model(
+            os.getenv("MODEL_TYPE", "ollama").lower(),
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+    
+    @staticmethod
+    def create_provider_model(model_type, model_name=None, temperature=0.7, max_tokens=None):
+        """
+        Create the chat model for a single provider.
+        model_name defaults to the provider's <PROVIDER>_MODEL variable.
+        """
+        options = {"model_name": model_name, "temperature": temperature, "max_tokens": max_tokens}
         if model_type == "ollama":
-            return ModelFactory._create_ollama_model()
+            return ModelFactory._create_ollama_model(**options)
         elif model_type == "huggingface":
-            return ModelFactory._create_huggingface_model()
+            return ModelFactory._create_huggingface_model(**options)
         elif model_type == "groq":
-            return ModelFactory._create_groq_model()
+            return ModelFactory._create_groq_model(**options)
         elif model_type == "together":
-            return ModelFactory._create_together_model()
+            return ModelFactory._create_together_model(**options)
         elif model_type == "openrouter":
-            return ModelFactory._create_openrouter_model()
+            return ModelFactory._create_openrouter_model(**options)
         elif model_type == "google" or model_type == "gemini":
-            return ModelFactory._create_google_model()
+            return ModelFactory._create_google_model(**options)
+        elif model_type == "fake":
+            return ModelFactory._create_fake_model(**options)
         else:
             # Default to Ollama
             print(f"⚠️  Unknown MODEL_TYPE '{model_type}', defaulting to Ollama")
-            return ModelFactory._create_ollama_model()
+            return ModelFactory._create_ollama_model(**options)
+    
+    @staticmethod
+    def node_model_config(node):
+        """
+        Per-node model settings from <NODE>_MODEL_TYPE, <NODE>_MODEL_NAME,
+        <NODE>_TEMPERATURE and <NODE>_MAX_TOKENS (e.g. RESEARCH_PLAN_MODEL_TYPE).
+        Returns None when the node has no overrides.
+        """
+        prefix = node.upper()
+        model_type = os.getenv(f"{prefix}_MODEL_TYPE")
+        model_name = os.getenv(f"{prefix}_MODEL_NAME")
+        temperature = os.getenv(f"{prefix}_TEMPERATURE")
+        max_tokens = os.getenv(f"{prefix}_MAX_TOKENS")
+        if not any((model_type, model_name, temperature, max_tokens)):
+            return None
+        return {
+            "model_type": model_type.lower() if model_type else None,
+            "model_name": model_name or None,
+            "temperature": float(temperature) if temperature else 0.7,
+            "max_tokens": int(max_tokens) if max_tokens else None,
+        }
+    
+    @staticmethod
+    def create_node_models(nodes, default_model):
+        """
+        Map every node to its chat model. Nodes without overrides share
+        `default_model`; nodes with identical overrides share one instance.
+        """
+        models = {}
+        built = {}
+        for node in nodes:
+            config = ModelFactory.node_model_config(node)
+            if config is None:
+                models[node] = default_model
+                continue
+            
+            key = tuple(sorted(config.items()))
+            if key not in built:
+                model_type = config["model_type"]
+                if model_type:
+                    built[key] = ModelFactory.create_provider_model(
+                        model_type,
+                        model_name=config["model_name"],
+                        temperature=config["temperature"],
+                        max_tokens=config["max_tokens"],
+                    )
+                elif config["model_name"]:
+                    built[key] = ModelFactory.create_provider_model(
+                        os.getenv("MODEL_TYPE", "ollama").lower(),
+                        model_name=config["model_name"],
+                        temperature=config["temperature"],
+                        max_tokens=config["max_tokens"],
+                    )
+                else:
+                    built[key] = ModelFactory.create_model(
+                        temperature=config["temperature"],
+                        max_tokens=config["max_tokens"],
+                    )
+            models[node] = built[key]
+            print(f"✅ Node '{node}' uses its own model settings")
+        return models
+    
+    @staticmethod
+    def _create_routing_model(providers, temperature=0.7, max_tokens=None):
+        """Build every routed provider; providers that fail to initialize are skipped"""
+        models = []
+        for provider in providers:
+            try:
+                models.append((provider, ModelFactory.create_provider_model(
+                    provider, temperature=temperature, max_tokens=max_tokens
+                )))
+            except Exception as e:
+                print(f"⚠️  Skipping provider '{provider}' for routing: {str(e)}")
+        
+        if not models:
+            raise ValueError(f"None of the MODEL_ROUTING providers could be initialized: {', '.join(providers)}")
+        if len(models) == 1:
+            return models[0][1]
+        
+        print(f"✅ Routing across providers: {', '.join(name for name, _ in models)}")
+        return RoutingChatModel(models)
+    
+    @staticmethod
+    def model_identity(model, provider=None):
+        """
+        Describe a model by provider, model name and temperature.
+        Used to key cached responses.
+        """
+        if isinstance(model, RoutingChatModel):
+            return {"provider": "routing", "model": ",".join(model.providers), "temperature": None}
+        model_name = (
+            getattr(model, "model_name", None)
+            or getattr(model, "model", None)
+            or getattr(getattr(model, "llm", None), "repo_id", None)
+        )
+        return {
+            "provider": provider or os.getenv("MODEL_TYPE", "ollama").lower(),
+            "model": model_name,
+            "temperature": getattr(model, "temperature", None),
+        }
     
     @staticmethod
-    def _create_ollama_model():
+    def http_clients(provider):
+        """
+        Shared sync/async HTTP clients for an OpenAI-style provider SDK.
+        Every model of the same provider reuses one keep-alive pool.
+        """
+        return {
+            "http_client": http_pool.http_client(provider),
+            "http_async_client": http_pool.async_http_client(provider),
+        }
+    
+    @staticmethod
+    def _create_ollama_model(model_name=None, temperature=0.7, max_tokens=None):
         """Create Ollama model (free, local)"""
         try:
             from langchain_ollama import ChatOllama
             
             base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            model_name = os.getenv("OLLAMA_MODEL", "llama3.2")
+            model_name = model_name or os.getenv("OLLAMA_MODEL", "llama3.2")
             
-            # Check if Ollama is accessible
+            # One cached probe checks both that Ollama is up and that the model is pulled
             try:
-                import requests
-                response = requests.get(f"{base_url}/api/tags", timeout=2)
-                if response.status_code != 200:
-                    raise ConnectionError("Ollama service not responding")
-            except Exception as e:
+                tags = http_pool.probe(f"{base_url}/api/tags")
+            except ConnectionError as e:
                 raise ConnectionError(
                     f"Cannot connect to Ollama at {base_url}. "
                     f"Make sure Ollama is running: ollama serve\n"
                     f"Error: {str(e)}"
                 )
             
-            # Check if model is available
-            try:
-                import requests
-                response = requests.get(f"{base_url}/api/tags", timeout=2)
-                if response.status_code == 200:
-                    models = response.json().get("models", [])
-                    model_names = [m.get("name", "") for m in models]
-                    # Check if exact match or starts with model name
-                    if not any(model_name in name or name.startswith(model_name) for name in model_names):
-                        raise ValueError(
-                            f"Model '{model_name}' not found in Ollama.\n"
-                            f"Available models: {', '.join(model_names) if model_names else 'None'}\n"
-                            f"Download it with: ollama pull {model_name}\n"
-                            f"Or run: .\\download_model.ps1"
-                        )
-            except ValueError:
-                raise  # Re-raise ValueError
-            except Exception:
-                # If we can't check, try anyway - might work
-                pass
+            model_names = [m.get("name", "") for m in tags.get("models", [])]
+            # Check if exact match or starts with model name
+            if not any(model_name in name or name.startswith(model_name) for name in model_names):
+                raise ValueError(
+                    f"Model '{model_name}' not found in Ollama.\n"
+                    f"Available models: {', '.join(model_names) if model_names else 'None'}\n"
+                    f"Download it with: ollama pull {model_name}\n"
+                    f"Or run: .\\download_model.ps1"
+                )
             
+            # the ollama client builds its own httpx clients; hand it the pool limits
+            # (local plain HTTP, so no HTTP/2)
             model = ChatOllama(
                 model=model_name,
                 base_url=base_url,
-                temperature=0.7,
+                temperature=temperature,
+                num_predict=max_tokens,
+                client_kwargs=http_pool.client_kwargs(http2=False),
             )
             print(f"✅ Using Ollama model: {model_name}")
             return model
@@ -105,7 +227,7 @@ class ModelFactory:
                            f"Make sure Ollama is running: ollama serve")
     
     @staticmethod
-    def _create_huggingface_model():
+    def _create_huggingface_model(model_name=None, temperature=0.7, max_tokens=None):
         """Create Hugging Face model"""
         try:
             from langchain_huggingface import ChatHuggingFace
@@ -115,12 +237,13 @@ class ModelFactory:
             if not api_key:
                 raise ValueError("HUGGINGFACE_API_KEY not set in .env")
             
-            model_name = os.getenv("HUGGINGFACE_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
+            model_name = model_name or os.getenv("HUGGINGFACE_MODEL", "mistralai/Mistral-7B-Instruct-v0.2")
             
             endpoint = HuggingFaceEndpoint(
                 repo_id=model_name,
                 huggingfacehub_api_token=api_key,
-                temperature=0.7,
+                temperature=temperature,
+                **({"max_new_tokens": max_tokens} if max_tokens else {}),
             )
             
             model = ChatHuggingFace(llm=endpoint)
@@ -134,7 +257,7 @@ class ModelFactory:
             raise ValueError(f"Failed to create Hugging Face model: {str(e)}")
     
     @staticmethod
-    def _create_groq_model():
+    def _create_groq_model(model_name=None, temperature=0.7, max_tokens=None):
         """Create Groq model (free tier, very fast)"""
         try:
             from langchain_groq import ChatGroq
@@ -143,12 +266,14 @@ class ModelFactory:
             if not api_key:
                 raise ValueError("GROQ_API_KEY not set in .env. Get it from: https://console.groq.com")
             
-            model_name = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+            model_name = model_name or os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
             
             model = ChatGroq(
                 model=model_name,
                 groq_api_key=api_key,
-                temperature=0.7,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **ModelFactory.http_clients("groq"),
             )
             print(f"✅ Using Groq model: {model_name}")
             return model
@@ -160,7 +285,7 @@ class ModelFactory:
             raise ValueError(f"Failed to create Groq model: {str(e)}")
     
     @staticmethod
-    def _create_together_model():
+    def _create_together_model(model_name=None, temperature=0.7, max_tokens=None):
         """Create Together AI model"""
         try:
             from langchain_together import ChatTogether
@@ -169,12 +294,14 @@ class ModelFactory:
             if not api_key:
                 raise ValueError("TOGETHER_API_KEY not set in .env. Get it from: https://api.together.xyz")
             
-            model_name = os.getenv("TOGETHER_MODEL", "meta-llama/Llama-2-7b-chat-hf")
+            model_name = model_name or os.getenv("TOGETHER_MODEL", "meta-llama/Llama-2-7b-chat-hf")
             
             model = ChatTogether(
                 model=model_name,
                 together_api_key=api_key,
-                temperature=0.7,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **ModelFactory.http_clients("together"),
             )
             print(f"✅ Using Together AI model: {model_name}")
             return model
@@ -186,7 +313,25 @@ class ModelFactory:
             raise ValueError(f"Failed to create Together AI model: {str(e)}")
     
     @staticmethod
-    def _create_openrouter_model():
+    def _create_fake_model(model_name=None, temperature=0.7, max_tokens=None):
+        """
+        Create the offline fake model used by benchmarks (src/fake_providers.py).
+        Timing comes from FAKE_MODEL_LATENCY_MS, FAKE_MODEL_TOKENS_PER_SEC and
+        FAKE_MODEL_RESPONSE_TOKENS (capped by max_tokens).
+        """
+        from src.fake_providers import FakeChatModel
+
+        response_tokens = int(os.getenv("FAKE_MODEL_RESPONSE_TOKENS", "200"))
+        model = FakeChatModel(
+            latency_ms=float(os.getenv("FAKE_MODEL_LATENCY_MS", "50")),
+            tokens_per_sec=float(os.getenv("FAKE_MODEL_TOKENS_PER_SEC", "200")),
+            response_tokens=min(response_tokens, max_tokens) if max_tokens else response_tokens,
+        )
+        print(f"✅ Using fake model ({model.latency_ms:.0f} ms + {model.tokens_per_sec:.0f} tokens/s)")
+        return model
+    
+    @staticmethod
+    def _create_openrouter_model(model_name=None, temperature=0.7, max_tokens=None):
         """Create OpenRouter model"""
         try:
             from langchain_openai import ChatOpenAI
@@ -195,13 +340,15 @@ class ModelFactory:
             if not api_key:
                 raise ValueError("OPENROUTER_API_KEY not set in .env. Get it from: https://openrouter.ai")
             
-            model_name = os.getenv("OPENROUTER_MODEL", "google/gemini-flash-1.5-8b")
+            model_name = model_name or os.getenv("OPENROUTER_MODEL", "google/gemini-flash-1.5-8b")
             
             model = ChatOpenAI(
                 model=model_name,
                 api_key=api_key,
                 base_url="https://openrouter.ai/api/v1",
-                temperature=0.7,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **ModelFactory.http_clients("openrouter"),
             )
             print(f"✅ Using OpenRouter model: {model_name}")
             return model
@@ -213,7 +360,7 @@ class ModelFactory:
             raise ValueError(f"Failed to create OpenRouter model: {str(e)}")
     
     @staticmethod
-    def _create_google_model():
+    def _create_google_model(model_name=None, temperature=0.7, max_tokens=None):
         """Create Google Gemini model (original)"""
         try:
             from langchain_google_genai import ChatGoogleGenerativeAI
@@ -221,12 +368,14 @@ class ModelFactory:
             from google.auth.transport.requests import Request
             
             google_api_key = os.getenv("GOOGLE_API_KEY")
+            model_name = model_name or os.getenv("GOOGLE_MODEL", "gemini-1.5-flash")
             service_account_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
             
             if google_api_key:
                 model = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-flash",
-                    temperature=0.7,
+                    model=model_name,
+                    temperature=temperature,
+                    max_output_tokens=max_tokens,
                     google_api_key=google_api_key,
                 )
                 print("✅ Using Google Gemini with API key")
@@ -242,8 +391,9 @@ class ModelFactory:
                 creds.refresh(Request())
                 
                 model = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-flash",
-                    temperature=0.7,
+                    model=model_name,
+                    temperature=temperature,
+                    max_output_tokens=max_tokens,
                     credentials=creds,
                 )
                 print("✅ Using Google Gemini with service account")
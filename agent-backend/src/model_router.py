@@ -0,0 +1,270 @@
+"""
+Model Router - Latency-aware routing, fallback and hedging across chat providers
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dotenv import load_dotenv
+
+from src import metrics
+
+load_dotenv()
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _is_rate_limit(error):
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "rate limit" in str(error).lower()
+
+
+class ProviderStats:
+    """Rolling latency and error window for one provider"""
+
+    def __init__(self, window, cooldown):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True = success
+        self.cooldown = cooldown
+        self.cooldown_until = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, latency, error=None):
+        with self.lock:
+            self.outcomes.append(error is None)
+            if error is None:
+                self.latencies.append(latency)
+            elif _is_rate_limit(error):
+                # back off a rate-limited provider entirely for a while
+                self.cooldown_until = time.time() + self.cooldown
+
+    def record_censored(self, latency):
+        """A call abandoned after `latency` seconds (lost a hedge): at least that slow"""
+        with self.lock:
+            self.latencies.append(latency)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            outcomes = list(self.outcomes)
+            cooldown_until = self.cooldown_until
+        return {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "error_rate": outcomes.count(False) / len(outcomes) if outcomes else 0.0,
+            "calls": len(outcomes),
+            "cooling_down": cooldown_until > time.time(),
+        }
+
+
+class RoutingChatModel:
+    """
+    Holds several chat models (one per provider) and sends each call to the
+    fastest healthy one, ranked by rolling p50 latency. A provider is
+    unhealthy while its error rate is above MODEL_ROUTING_MAX_ERROR_RATE or
+    it is cooling down after a rate limit. Failed calls fall back to the
+    next provider.
+
+    With MODEL_HEDGE_AFTER_MS set, a duplicate request goes to the
+    second-ranked provider when the first has not answered within that many
+    milliseconds; the first successful response wins. The hedged request
+    does not forward stream callbacks, so streamed tokens always come from
+    the first request.
+    """
+
+    def __init__(self, models, window=None, max_error_rate=None, cooldown=None,
+                 hedge_after_ms=None, _stats=None, _pool=None):
+        """
+        models: list of (provider name, chat model or runnable), in preference order
+        window: calls kept per provider for latency/error stats (MODEL_ROUTING_WINDOW, default 50)
+        max_error_rate: error rate above which a provider is skipped (MODEL_ROUTING_MAX_ERROR_RATE, default 0.5)
+        cooldown: seconds a rate-limited provider is skipped (MODEL_ROUTING_COOLDOWN, default 30)
+        hedge_after_ms: hedge threshold in ms (MODEL_HEDGE_AFTER_MS, default 0 = off)
+        """
+        self.models = list(models)
+        self.max_error_rate = max_error_rate if max_error_rate is not None else float(
+            os.getenv("MODEL_ROUTING_MAX_ERROR_RATE", "0.5"))
+        self.hedge_after = (hedge_after_ms if hedge_after_ms is not None else float(
+            os.getenv("MODEL_HEDGE_AFTER_MS", "0"))) / 1000.0
+
+        if _stats is None:
+            window = window or int(os.getenv("MODEL_ROUTING_WINDOW", "50"))
+            cooldown = cooldown if cooldown is not None else float(os.getenv("MODEL_ROUTING_COOLDOWN", "30"))
+            _stats = {name: ProviderStats(window, cooldown) for name, _ in self.models}
+        self._stats = _stats
+        self._pool = _pool or ThreadPoolExecutor(
+            max_workers=int(os.getenv("MODEL_HEDGE_WORKERS", "16")),
+            thread_name_prefix="model-hedge",
+        )
+
+    @property
+    def providers(self):
+        return [name for name, _ in self.models]
+
+    def stats(self):
+        return {name: self._stats[name].snapshot() for name in self.providers}
+
+    def ranked(self):
+        """
+        Providers in routing order: healthy first, then by p50. A provider
+        without latency data is ranked as slow as the slowest measured one,
+        (and after it on a tie), so it does not jump ahead of providers known
+        to be fast.
+        """
+        snapshots = {name: self._stats[name].snapshot() for name in self.providers}
+        measured = [s["p50"] for s in snapshots.values() if s["p50"] is not None]
+        unknown_p50 = max(measured) if measured else 0.0
+
+        def key(item):
+            index, (name, _) = item
+            s = snapshots[name]
+            unhealthy = s["cooling_down"] or (s["calls"] >= 5 and s["error_rate"] > self.max_error_rate)
+            unmeasured = s["p50"] is None
+            return (unhealthy, unknown_p50 if unmeasured else s["p50"], unmeasured, index)
+
+        return [model for _, model in sorted(enumerate(self.models), key=key)]
+
+    def _derive(self, transform):
+        """Apply `transform` to every provider model, sharing stats and pool"""
+        return RoutingChatModel(
+            [(name, transform(model)) for name, model in self.models],
+            max_error_rate=self.max_error_rate,
+            hedge_after_ms=self.hedge_after * 1000.0,
+            _stats=self._stats,
+            _pool=self._pool,
+        )
+
+    def with_structured_output(self, schema, **kwargs):
+        return self._derive(lambda m: m.with_structured_output(schema, **kwargs))
+
+    def bind(self, **kwargs):
+        return self._derive(lambda m: m.bind(**kwargs))
+
+    def __getattr__(self, name):
+        # anything else (stream, batch, ...) goes to the first provider, unrouted
+        models = self.__dict__.get("models")
+        if not models:
+            raise AttributeError(name)
+        return getattr(models[0][1], name)
+
+    @staticmethod
+    def _hedge_config(config):
+        return {**(config or {}), "callbacks": None}
+
+    # ---------------- sync ----------------
+
+    def _call(self, name, model, input, config, **kwargs):
+        started = time.monotonic()
+        try:
+            result = model.invoke(input, config, **kwargs)
+        except Exception as e:
+            self._stats[name].record(time.monotonic() - started, e)
+            metrics.PROVIDER_SECONDS.observe(time.monotonic() - started, provider=name)
+            raise
+        self._stats[name].record(time.monotonic() - started)
+        metrics.PROVIDER_SECONDS.observe(time.monotonic() - started, provider=name)
+        return result
+
+    def invoke(self, input, config=None, **kwargs):
+        order = self.ranked()
+        errors = []
+        while order:
+            name, model = order.pop(0)
+            if errors:
+                metrics.LLM_RETRIES.inc(provider=name, reason="fallback")
+            if self.hedge_after <= 0 or not order:
+                # no hedge possible: call inline and fall back on failure
+                try:
+                    return self._call(name, model, input, config, **kwargs)
+                except Exception as e:
+                    print(f"Model provider '{name}' failed: {str(e)}")
+                    errors.append(e)
+                    continue
+
+            futures = {self._pool.submit(self._call, name, model, input, config, **kwargs): name}
+            done, _ = wait(futures, timeout=self.hedge_after)
+            if not done:
+                hedge_name, hedge_model = order.pop(0)
+                print(f"Hedging slow '{name}' call with '{hedge_name}'")
+                metrics.LLM_RETRIES.inc(provider=hedge_name, reason="hedge")
+                futures[self._pool.submit(
+                    self._call, hedge_name, hedge_model, input, self._hedge_config(config), **kwargs
+                )] = hedge_name
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        # the losing request keeps running; its latency still feeds the stats
+                        return future.result()
+                    except Exception as e:
+                        print(f"Model provider '{futures[future]}' failed: {str(e)}")
+                        errors.append(e)
+
+        raise errors[-1] if errors else RuntimeError("No model providers configured")
+
+    # ---------------- async ----------------
+
+    async def _acall(self, name, model, input, config, **kwargs):
+        started = time.monotonic()
+        try:
+            result = await model.ainvoke(input, config, **kwargs)
+        except asyncio.CancelledError:
+            # lost a hedge: it took at least this long, which must count
+            # against the provider or it keeps its rank and every call hedges
+            self._stats[name].record_censored(max(time.monotonic() - started, self.hedge_after))
+            raise
+        except Exception as e:
+            self._stats[name].record(time.monotonic() - started, e)
+            metrics.PROVIDER_SECONDS.observe(time.monotonic() - started, provider=name)
+            raise
+        self._stats[name].record(time.monotonic() - started)
+        metrics.PROVIDER_SECONDS.observe(time.monotonic() - started, provider=name)
+        return result
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        order = self.ranked()
+        errors = []
+        while order:
+            name, model = order.pop(0)
+            if errors:
+                metrics.LLM_RETRIES.inc(provider=name, reason="fallback")
+            tasks = {asyncio.ensure_future(self._acall(name, model, input, config, **kwargs)): name}
+
+            if self.hedge_after > 0 and order:
+                done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+                if not done:
+                    hedge_name, hedge_model = order.pop(0)
+                    print(f"Hedging slow '{name}' call with '{hedge_name}'")
+                    metrics.LLM_RETRIES.inc(provider=hedge_name, reason="hedge")
+                    tasks[asyncio.ensure_future(self._acall(
+                        hedge_name, hedge_model, input, self._hedge_config(config), **kwargs
+                    ))] = hedge_name
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"Model provider '{tasks[task]}' failed: {str(e)}")
+                        errors.append(e)
+                        continue
+                    for loser in pending:
+                        loser.cancel()
+                    # let the losers record their censored latency before the next call ranks
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    return result
+
+        raise errors[-1] if errors else RuntimeError("No model providers configured")
@@ -1,7 +1,6 @@
 from langgraph.graph import END
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_core.messages import AnyMessage, SystemMessage, HumanMessage, AIMessage, ChatMessage
-from tavily import TavilyClient
+from langchain_core.runnables import RunnableConfig
 
 from dotenv import load_dotenv
 import os
@@ -10,6 +9,19 @@ load_dotenv()
 
 # Model Factory - supports multiple free models
 from src.model_factory import ModelFactory
+from src.checkpointer import CheckpointRetention, checkpointer_backend, create_checkpointer
+from src.search_executor import SearchExecutor
+from src.search_cache import CachedSearchClient, SearchCache
+from src.response_cache import CachedChatModel, ResponseCache
+from src.context_budget import ContextBudget
+from src import http_pool
+from src.speculation import Speculator, thread_of
+from src.convergence import ConvergenceCheck, draft_similarity
+from src.query_index import QueryIndex
+from src.answer_store import AnswerStore
+from src.model_router import RoutingChatModel
+from src import metrics
+from src.stream_protocol import chunk_text
 
 # import prompt templates
 from utils.prompts import (
@@ -28,10 +40,14 @@ class NodePipeline:
     Pipeline using Tavily + Gemini through LangChain (Service Account Version)
     """
 
+    NODES = ("planner", "research_plan", "generate", "reflect", "research_critique")
+
     def __init__(self):
         super().__init__()
 
-        self.memory = MemorySaver()
+        # --- Checkpointer (CHECKPOINTER=memory|sqlite|postgres|redis) ---
+        self.memory = create_checkpointer()
+        self.retention = CheckpointRetention(self.memory)
 
         # --- Load Chat Model (supports multiple free providers) ---
         try:
@@ -48,188 +64,477 @@ class NodePipeline:
                 "\nSee FREE_MODELS.md for setup instructions."
             )
 
-        # --- Initialize Tavily client ---
+        # --- Per-node model tiering (<NODE>_MODEL_TYPE, _MODEL_NAME, _TEMPERATURE, _MAX_TOKENS) ---
+        self.node_models = ModelFactory.create_node_models(self.NODES, self.model)
+
+        # --- Opt-in LLM response cache, enabled per node ---
+        self.response_cache = None
+        self.cached_nodes = set()
+        self._wrapped_models = {}
+        if os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true":
+            self.response_cache = ResponseCache()
+            self.cached_nodes = {
+                n.strip() for n in os.getenv("LLM_CACHE_NODES", "planner").split(",") if n.strip()
+            }
+            for node in self.cached_nodes & set(self.NODES):
+                node_config = ModelFactory.node_model_config(node) or {}
+                self._wrapped_models[node] = CachedChatModel(
+                    self.node_models[node],
+                    self.response_cache,
+                    ModelFactory.model_identity(self.node_models[node], node_config.get("model_type")),
+                )
+
+        # --- Per-node call metrics (GET /metrics) ---
+        if metrics.metrics_enabled():
+            for node in self.NODES:
+                self._wrapped_models[node] = metrics.InstrumentedChatModel(
+                    self._model_for(node), node, self._provider_of(node)
+                )
+
+        # --- Initialize search client (SEARCH_PROVIDER=tavily|fake) ---
+        self.search_provider = os.getenv("SEARCH_PROVIDER", "tavily").lower()
+        if self.search_provider == "fake":
+            # offline stand-in for benchmarks (see src/fake_providers.py)
+            from src.fake_providers import FakeSearchClient, AsyncFakeSearchClient
+            self.tavily = FakeSearchClient()
+            self.async_tavily = AsyncFakeSearchClient()
+        else:
+            self._init_tavily()
+
+        # --- Search result cache in front of Tavily ---
+        self.search_cache = None
+        search_client = self.tavily
+        if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true":
+            self.search_cache = SearchCache()
+            search_client = CachedSearchClient(self.tavily, self.search_cache, self.async_tavily)
+
+        # --- Shared concurrent search fan-out for the research nodes ---
+        self.search_executor = SearchExecutor(
+            search_client, async_client=self.async_tavily, provider=self.search_provider
+        )
+
+        # --- Near-duplicate query detection (per thread, optionally global) ---
+        self.query_index = QueryIndex()
+
+        # --- Answers live once in a content-addressed store; state holds their refs ---
+        # on by default where the store can outlive the checkpoints' process
+        # (memory, or SQLite next to the sqlite checkpointer); a shared
+        # postgres/redis checkpointer keeps answers inline unless
+        # ANSWER_STORE_PATH points at storage every worker can reach
+        self.answer_store = None
+        store_default = "true" if checkpointer_backend() in ("memory", "sqlite") else "false"
+        if os.getenv("ANSWER_STORE_ENABLED", store_default).lower() == "true":
+            self.answer_store = AnswerStore()
+            # a thread's answers go when retention deletes the thread
+            self.retention.on_delete.append(self.answer_store.release)
+
+        # --- Prompt context stays within a fixed token budget across revisions ---
+        self.context_budget = ContextBudget()
+
+        # --- Early exit from the revision loop ---
+        self.convergence = ConvergenceCheck()
+
+        # --- Speculative critique research (opt-in) ---
+        # reflect streams its critique; once SPECULATIVE_MIN_CHARS have arrived,
+        # research_critique's query generation and searches start on that partial
+        # critique while the rest is still being generated
+        self.speculator = None
+        self.speculative_min_chars = int(os.getenv("SPECULATIVE_MIN_CHARS", "400"))
+        if os.getenv("SPECULATIVE_EXECUTION", "false").lower() == "true":
+            self.speculator = Speculator()
+
+    def _init_tavily(self):
+        # imported here so the fake search provider never loads tavily-python
+        from tavily import TavilyClient
+
         tavily_api_key = os.getenv("TAVILY_API_KEY")
         if not tavily_api_key:
             raise ValueError("TAVILY_API_KEY environment variable is not set")
         
         try:
+            # reuse one keep-alive pool for every search (see src/http_pool.py)
+            self.tavily = TavilyClient(api_key=tavily_api_key, session=http_pool.requests_session("tavily"))
+        except TypeError:
+            # tavily-python < 0.5 does not accept a session
             self.tavily = TavilyClient(api_key=tavily_api_key)
         except Exception as e:
             raise ValueError(f"Failed to initialize Tavily client: {str(e)}")
 
-    def plan_node(self, state: AgentState):
+        # async client for the graph.ainvoke/astream path (older tavily-python lacks it)
+        try:
+            from tavily import AsyncTavilyClient
+            self.async_tavily = AsyncTavilyClient(
+                api_key=tavily_api_key,
+                client=http_pool.async_http_client("tavily"),
+            )
+        except (ImportError, TypeError):
+            self.async_tavily = None
+
+    def after_fork(self):
+        """
+        Re-create process-bound resources in a freshly forked worker.
+        Database connections and background threads must not be shared
+        with the parent process; model clients and prompts are.
+        """
+        if checkpointer_backend() != "memory":
+            self.memory = create_checkpointer()
+        self.retention = CheckpointRetention(self.memory)
+        if self.answer_store is not None:
+            self.retention.on_delete.append(self.answer_store.release)
+        http_pool.after_fork()
+        for cache in (self.search_cache, self.response_cache, self.answer_store):
+            if cache is not None:
+                cache.reopen()
+
+    def _model_for(self, node):
+        """Return the chat model a node should call (cached and instrumented if enabled)"""
+        if node in self._wrapped_models:
+            return self._wrapped_models[node]
+        return self.node_models.get(node, self.model)
+
+    def _provider_of(self, node):
+        """Provider label for a node's model metrics"""
+        node_config = ModelFactory.node_model_config(node) or {}
+        if node_config.get("model_type"):
+            return node_config["model_type"]
+        if isinstance(self.node_models.get(node, self.model), RoutingChatModel):
+            # per-provider latency is recorded by the router itself
+            return "routed"
+        return os.getenv("MODEL_TYPE", "ollama").lower()
+
+    def resolve_answers(self, answers):
+        """Answer texts for a state's answers (refs when the answer store is on)"""
+        if self.answer_store is None:
+            return list(answers or [])
+        return self.answer_store.resolve(answers)
+
+    def resolve_state(self, values):
+        """Copy of state values with answer refs replaced by their texts, for API responses"""
+        values = dict(values or {})
+        if "answers" in values:
+            values["answers"] = self.resolve_answers(values["answers"])
+        return values
+
+    # ------------------------------------------------------------------
+    # Node inputs/outputs, shared by the sync and async node variants
+    # ------------------------------------------------------------------
+
+    def _plan_messages(self, state):
+        task = state.get("task", "")
+        if not task:
+            raise ValueError("Task is required for planning")
+
+        print(f"  [plan_node] Processing task: {task[:50]}...")
+        return [
+            SystemMessage(content=VACATION_PLANNING_SUPERVISOR_PROMPT),
+            HumanMessage(content=task),
+        ]
+
+    def _plan_update(self, resp):
+        print(f"  [plan_node] Model response received")
+        if not resp or not hasattr(resp, 'content'):
+            raise ValueError("Failed to generate plan from model - response has no content")
+
+        plan_content = resp.content
+        if not plan_content:
+            raise ValueError("Model returned empty plan content")
+
+        print(f"  [plan_node] Plan generated ({len(plan_content)} chars)")
+        return {"plan": plan_content}
+
+    def _plan_failed(self, e):
+        error_msg = f"Plan node failed: {str(e)}"
+        print(f"  [plan_node] ERROR: {error_msg}")
+        import traceback
+        traceback.print_exc()
+        return Exception(error_msg)
+
+    def _research_plan_messages(self, state):
+        plan = state.get("plan", "")
+        if not plan:
+            raise ValueError("Plan is required for research")
+
+        return [
+            SystemMessage(content=PLANNER_ASSISTANT_PROMPT),
+            HumanMessage(content=plan)
+        ]
+
+    def _research_critique_messages(self, state):
+        critique = state.get("critique", "")
+        if not critique:
+            raise ValueError("Critique is required for research")
+
+        task = state.get("task", "")
+        answers = self.context_budget.select(self.resolve_answers(state.get("answers")), critique, task)
+        return [
+            SystemMessage(content=PLANNER_CRITIQUE_ASSISTANT_PROMPT.format(
+                queries="\n".join(self.context_budget.recent_queries(state.get("queries"))),
+                answers="\n------\n".join(answers)
+            )),
+            HumanMessage(content=critique)
+        ]
+
+    def _checked_queries(self, queries, source):
+        if not queries or not hasattr(queries, 'queries'):
+            raise ValueError(f"Failed to generate research queries{source}")
+        return queries.queries
+
+    def _dedupe_queries(self, state, queries):
+        """
+        Drop near-duplicates of the thread's past queries and look up the
+        rest in the global index. Returns (queries, reused answers by query,
+        queries that still need a search).
+        """
+        queries = self.query_index.novel(queries, state.get("queries"))
+        reused = {q: self.query_index.lookup(q) for q in queries}
+        return queries, reused, [q for q in queries if reused[q] is None]
+
+    def _collect_answers(self, queries, reused, responses):
+        found = []
+        for query in queries:
+            if reused[query] is not None:
+                found.extend(reused[query])
+                continue
+            answers = self.search_executor.flatten([responses.get(query)])
+            self.query_index.add(query, answers)
+            found.extend(answers)
+        return found
+
+    def _search(self, state, queries, node):
+        """Search the new queries concurrently; returns (queries, answers)"""
+        queries, reused, missing = self._dedupe_queries(state, queries)
+        responses = dict(zip(missing, self.search_executor.search_many(missing, max_results=3, node=node)))
+        return queries, self._collect_answers(queries, reused, responses)
+
+    async def _asearch(self, state, queries, node):
+        queries, reused, missing = self._dedupe_queries(state, queries)
+        responses = dict(zip(missing, await self.search_executor.asearch_many(missing, max_results=3, node=node)))
+        return queries, self._collect_answers(queries, reused, responses)
+
+    def _research_update(self, state, queries, found, node, config=None):
+        past_queries = state.get("queries") or []
+        answers = state.get("answers") or []
+        past_queries.extend(queries)
+        if self.answer_store is not None:
+            found = self.answer_store.put(found, thread_of(config))
+        # identical answers carry no new information
+        seen = set(answers)
+        for answer in found:
+            if answer not in seen:
+                seen.add(answer)
+                answers.append(answer)
+        return {
+            "answers": answers,
+            "queries": past_queries,
+            "lnode": node,
+            "count": 1,
+        }
+
+    def _generation_messages(self, state):
+        task = state.get("task", "")
+        plan = state.get("plan", "")
+
+        if not task:
+            raise ValueError("Task is required for generation")
+        if not plan:
+            raise ValueError("Plan is required for generation")
+
+        # only the most relevant answers, packed into CONTEXT_TOKEN_BUDGET
+        selected = self.context_budget.select(
+            self.resolve_answers(state.get("answers")), task, plan, state.get("critique", "")
+        )
+        answers = "\n------\n".join(selected) if selected else "No research data available."
+        user_message = HumanMessage(
+            content=f"{task}\n\nHere is my plan:\n\n{plan}"
+        )
+
+        return [
+            SystemMessage(content=VACATION_PLANNER_PROMPT.format(answers=answers)),
+            user_message,
+        ]
+
+    def _generation_update(self, state, resp):
+        if not resp or not hasattr(resp, 'content'):
+            raise ValueError("Failed to generate draft from model")
+
+        return {
+            "draft": resp.content,
+            # compared by should_continue; cheaper than keeping the old draft in state
+            "draft_similarity": draft_similarity(state.get("draft", ""), resp.content),
+            "revision_number": state.get("revision_number", 0) + 1,
+            "lnode": "generate",
+            "count": 1,
+        }
+
+    def _reflection_messages(self, state):
+        draft = state.get("draft", "")
+        if not draft:
+            raise ValueError("Draft is required for critique")
+
+        return [
+            SystemMessage(content=PLANNER_CRITIQUE_PROMPT),
+            HumanMessage(content=draft),
+        ]
+
+    def _reflection_update(self, resp):
+        if not resp or not hasattr(resp, 'content'):
+            raise ValueError("Failed to generate critique from model")
+
+        return {
+            "critique": resp.content,
+            "lnode": "reflect",
+            "count": 1,
+        }
+
+    def _speculative_state(self, state, partial):
+        print(f"  [reflect] Starting critique research on {len(partial)} chars of critique")
+        return {**state, "critique": partial}
+
+    # ------------------------------------------------------------------
+    # Sync nodes (graph.invoke / graph.stream)
+    # ------------------------------------------------------------------
+
+    def plan_node(self, state: AgentState, config: RunnableConfig = None):
+        try:
+            msgs = self._plan_messages(state)
+            print(f"  [plan_node] Invoking model...")
+            # config carries LangGraph's stream callbacks so tokens reach stream_mode="messages"
+            resp = self._model_for("planner").invoke(msgs, config)
+            return self._plan_update(resp)
+        except Exception as e:
+            raise self._plan_failed(e)
+
+    def research_plan_node(self, state: AgentState, config: RunnableConfig = None):
         try:
-            task = state.get("task", "")
-            if not task:
-                raise ValueError("Task is required for planning")
+            msgs = self._research_plan_messages(state)
+            queries = self._model_for("research_plan").with_structured_output(Queries).invoke(msgs, config)
+            queries, found = self._search(state, self._checked_queries(queries, ""), "research_plan")
+            return self._research_update(state, queries, found, "research_plan", config)
+        except Exception as e:
+            raise Exception(f"Research plan node failed: {str(e)}")
+
+    def generation_node(self, state: AgentState, config: RunnableConfig = None):
+        try:
+            msgs = self._generation_messages(state)
+            resp = self._model_for("generate").invoke(msgs, config)
+            return self._generation_update(state, resp)
+        except Exception as e:
+            raise Exception(f"Generation node failed: {str(e)}")
+
+    def reflection_node(self, state: AgentState, config: RunnableConfig = None):
+        try:
+            msgs = self._reflection_messages(state)
+            if self.speculator is None:
+                resp = self._model_for("reflect").invoke(msgs, config)
+                return self._reflection_update(resp)
+
+            text = ""
+            speculating = False
+            for chunk in self._model_for("reflect").stream(msgs, config):
+                text += chunk_text(chunk)
+                if not speculating and len(text) >= self.speculative_min_chars:
+                    speculating = True
+                    self.speculator.start(
+                        thread_of(config), self._critique_research, self._speculative_state(state, text)
+                    )
+            return self._reflection_update(AIMessage(content=text))
+        except Exception as e:
+            raise Exception(f"Reflection node failed: {str(e)}")
 
-            print(f"  [plan_node] Processing task: {task[:50]}...")
-            
-            msgs = [
-                SystemMessage(content=VACATION_PLANNING_SUPERVISOR_PROMPT),
-                HumanMessage(content=task),
-            ]
+    def _critique_research(self, state, config=None):
+        msgs = self._research_critique_messages(state)
+        queries = self._model_for("research_critique").with_structured_output(Queries).invoke(msgs, config)
+        return self._search(state, self._checked_queries(queries, " from critique"), "research_critique")
 
+    def research_critique_node(self, state: AgentState, config: RunnableConfig = None):
+        try:
+            speculated = self.speculator.take(thread_of(config)) if self.speculator else None
+            queries, found = speculated or self._critique_research(state, config)
+            return self._research_update(state, queries, found, "research_critique", config)
+        except Exception as e:
+            raise Exception(f"Research critique node failed: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Async nodes (graph.ainvoke / graph.astream): same steps, awaiting
+    # the model and the search fan-out instead of blocking a thread
+    # ------------------------------------------------------------------
+
+    async def aplan_node(self, state: AgentState, config: RunnableConfig = None):
+        try:
+            msgs = self._plan_messages(state)
             print(f"  [plan_node] Invoking model...")
-            resp = self.model.invoke(msgs)
-            print(f"  [plan_node] Model response received")
-            
-            if not resp or not hasattr(resp, 'content'):
-                raise ValueError("Failed to generate plan from model - response has no content")
-            
-            plan_content = resp.content
-            if not plan_content:
-                raise ValueError("Model returned empty plan content")
-            
-            print(f"  [plan_node] Plan generated ({len(plan_content)} chars)")
-            return {"plan": plan_content}
+            resp = await self._model_for("planner").ainvoke(msgs, config)
+            return self._plan_update(resp)
         except Exception as e:
-            error_msg = f"Plan node failed: {str(e)}"
-            print(f"  [plan_node] ERROR: {error_msg}")
-            import traceback
-            traceback.print_exc()
-            raise Exception(error_msg)
+            raise self._plan_failed(e)
 
-    def research_plan_node(self, state: AgentState):
+    async def aresearch_plan_node(self, state: AgentState, config: RunnableConfig = None):
         try:
-            past_queries = state.get("queries") or []
-            answers = state.get("answers") or []
-            
-            plan = state.get("plan", "")
-            if not plan:
-                raise ValueError("Plan is required for research")
-
-            queries = self.model.with_structured_output(Queries).invoke([
-                SystemMessage(content=PLANNER_ASSISTANT_PROMPT),
-                HumanMessage(content=plan)
-            ])
-
-            if not queries or not hasattr(queries, 'queries'):
-                raise ValueError("Failed to generate research queries")
-
-            for q in queries.queries:
-                try:
-                    resp = self.tavily.search(query=q, max_results=3)
-                    if resp and "results" in resp:
-                        for r in resp["results"]:
-                            if "content" in r:
-                                answers.append(r["content"])
-                except Exception as e:
-                    # Log error but continue with other queries
-                    print(f"Error searching for query '{q}': {str(e)}")
-                    continue
-
-            past_queries.extend(queries.queries)
-            return {
-                "answers": answers,
-                "queries": past_queries,
-                "lnode": "research_plan",
-                "count": 1,
-            }
+            msgs = self._research_plan_messages(state)
+            queries = await self._model_for("research_plan").with_structured_output(Queries).ainvoke(msgs, config)
+            queries, found = await self._asearch(state, self._checked_queries(queries, ""), "research_plan")
+            return self._research_update(state, queries, found, "research_plan", config)
         except Exception as e:
             raise Exception(f"Research plan node failed: {str(e)}")
 
-    def generation_node(self, state: AgentState):
+    async def ageneration_node(self, state: AgentState, config: RunnableConfig = None):
         try:
-            task = state.get("task", "")
-            plan = state.get("plan", "")
-            
-            if not task:
-                raise ValueError("Task is required for generation")
-            if not plan:
-                raise ValueError("Plan is required for generation")
-            
-            answers = "\n------\n".join(state.get("answers", [])) if state.get("answers") else "No research data available."
-            user_message = HumanMessage(
-                content=f"{task}\n\nHere is my plan:\n\n{plan}"
-            )
-
-            msgs = [
-                SystemMessage(content=VACATION_PLANNER_PROMPT.format(answers=answers)),
-                user_message,
-            ]
-
-            resp = self.model.invoke(msgs)
-            if not resp or not hasattr(resp, 'content'):
-                raise ValueError("Failed to generate draft from model")
-                
-            return {
-                "draft": resp.content,
-                "revision_number": state.get("revision_number", 0) + 1,
-                "lnode": "generate",
-                "count": 1,
-            }
+            msgs = self._generation_messages(state)
+            resp = await self._model_for("generate").ainvoke(msgs, config)
+            return self._generation_update(state, resp)
         except Exception as e:
             raise Exception(f"Generation node failed: {str(e)}")
 
-    def reflection_node(self, state: AgentState):
+    async def areflection_node(self, state: AgentState, config: RunnableConfig = None):
         try:
-            draft = state.get("draft", "")
-            if not draft:
-                raise ValueError("Draft is required for critique")
-
-            msgs = [
-                SystemMessage(content=PLANNER_CRITIQUE_PROMPT),
-                HumanMessage(content=draft),
-            ]
-
-            resp = self.model.invoke(msgs)
-            if not resp or not hasattr(resp, 'content'):
-                raise ValueError("Failed to generate critique from model")
-                
-            return {
-                "critique": resp.content,
-                "lnode": "reflect",
-                "count": 1,
-            }
+            msgs = self._reflection_messages(state)
+            if self.speculator is None:
+                resp = await self._model_for("reflect").ainvoke(msgs, config)
+                return self._reflection_update(resp)
+
+            text = ""
+            speculating = False
+            async for chunk in self._model_for("reflect").astream(msgs, config):
+                text += chunk_text(chunk)
+                if not speculating and len(text) >= self.speculative_min_chars:
+                    speculating = True
+                    self.speculator.astart(
+                        thread_of(config), self._acritique_research(self._speculative_state(state, text))
+                    )
+            return self._reflection_update(AIMessage(content=text))
         except Exception as e:
             raise Exception(f"Reflection node failed: {str(e)}")
 
-    def research_critique_node(self, state: AgentState):
+    async def _acritique_research(self, state, config=None):
+        msgs = self._research_critique_messages(state)
+        queries = await self._model_for("research_critique").with_structured_output(Queries).ainvoke(msgs, config)
+        return await self._asearch(state, self._checked_queries(queries, " from critique"), "research_critique")
+
+    async def aresearch_critique_node(self, state: AgentState, config: RunnableConfig = None):
         try:
-            past_queries = state.get("queries") or []
-            answers = state.get("answers") or []
-            critique = state.get("critique", "")
-            
-            if not critique:
-                raise ValueError("Critique is required for research")
-
-            queries = self.model.with_structured_output(Queries).invoke([
-                SystemMessage(content=PLANNER_CRITIQUE_ASSISTANT_PROMPT.format(
-                    queries=past_queries,
-                    answers=answers
-                )),
-                HumanMessage(content=critique)
-            ])
-
-            if not queries or not hasattr(queries, 'queries'):
-                raise ValueError("Failed to generate research queries from critique")
-
-            for q in queries.queries:
-                past_queries.append(q)
-                try:
-                    resp = self.tavily.search(query=q, max_results=3)
-                    if resp and "results" in resp:
-                        for r in resp["results"]:
-                            if "content" in r:
-                                answers.append(r["content"])
-                except Exception as e:
-                    # Log error but continue with other queries
-                    print(f"Error searching for query '{q}': {str(e)}")
-                    continue
-
-            return {
-                "queries": past_queries,
-                "answers": answers,
-                "lnode": "research_critique",
-                "count": 1,
-            }
+            speculated = await self.speculator.atake(thread_of(config)) if self.speculator else None
+            queries, found = speculated or await self._acritique_research(state, config)
+            return self._research_update(state, queries, found, "research_critique", config)
         except Exception as e:
             raise Exception(f"Research critique node failed: {str(e)}")
 
     def should_continue(self, state):
+        # checked right after generate, so the final revision never runs reflect
         if state["revision_number"] >= state["max_revisions"]:
+            print(f"  [convergence] Ending revision loop: max_revisions ({state['max_revisions']}) reached")
+            return END
+
+        reason = self.convergence.draft_converged(state)
+        if reason:
+            print(f"  [convergence] Ending revision loop after revision {state['revision_number']}: {reason}")
             return END
 
         return "reflect"
+
+    def should_research(self, state):
+        reason = self.convergence.critique_approved(state)
+        if reason:
+            print(f"  [convergence] Ending revision loop after revision {state.get('revision_number')}: {reason}")
+            return END
+
+        return "research_critique"
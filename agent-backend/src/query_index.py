@@ -0,0 +1,175 @@
+"""
+Query Index - Near-duplicate search query detection with answer reuse
+"""
+
+import os
+import time
+import random
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from dotenv import load_dotenv
+
+from src.search_cache import normalize_query
+
+load_dotenv()
+
+# question words add nothing to what a search is about
+_QUESTION_WORDS = frozenset({"when", "where", "how", "why", "who", "do", "does", "can", "should", "there"})
+
+_PRIME = (1 << 61) - 1
+
+
+def query_tokens(query):
+    """Content tokens of a query (normalized, stopwords and question words removed, crude plural folding)"""
+    tokens = set()
+    for token in normalize_query(query).split():
+        if token in _QUESTION_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.add(token)
+    return frozenset(tokens)
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class QueryIndex:
+    """
+    Finds searches that were already run under different wording.
+
+    novel() drops queries that are near-duplicates (token Jaccard >=
+    QUERY_DEDUPE_THRESHOLD) of the thread's past queries or of each other;
+    their answers are already in the thread's state.
+
+    With QUERY_INDEX_GLOBAL=true the index also remembers answers across
+    threads: a MinHash signature per query is split into LSH bands so
+    candidates are found without scanning every entry, then confirmed
+    with exact Jaccard. lookup() returns the stored answers of a
+    near-duplicate so its search can be skipped.
+    """
+
+    NUM_PERM = 32
+    BANDS = 8
+
+    def __init__(self, threshold=None, global_enabled=None, max_entries=None, ttl=None):
+        """
+        threshold: Jaccard similarity that counts as a duplicate (QUERY_DEDUPE_THRESHOLD, default 0.6)
+        global_enabled: keep a cross-thread index (QUERY_INDEX_GLOBAL, default false)
+        max_entries: LRU capacity of the global index (QUERY_INDEX_SIZE, default 2000)
+        ttl: lifetime of global entries in seconds (QUERY_INDEX_TTL, default SEARCH_CACHE_TTL or 86400)
+        """
+        self.threshold = threshold or float(os.getenv("QUERY_DEDUPE_THRESHOLD", "0.6"))
+        if global_enabled is None:
+            global_enabled = os.getenv("QUERY_INDEX_GLOBAL", "false").lower() == "true"
+        self.global_enabled = global_enabled
+        self.max_entries = max_entries or int(os.getenv("QUERY_INDEX_SIZE", "2000"))
+        self.ttl = ttl or float(os.getenv("QUERY_INDEX_TTL", os.getenv("SEARCH_CACHE_TTL", "86400")))
+
+        rng = random.Random(0x5EED)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(self.NUM_PERM)]
+        self._rows = self.NUM_PERM // self.BANDS
+
+        self._entries = OrderedDict()  # query -> (expires_at, tokens, bands, answers)
+        self._buckets = defaultdict(set)  # (band index, band hash) -> queries
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.reused = 0
+
+    # ---------------- per thread ----------------
+
+    def novel(self, queries, past_queries=None):
+        """Queries that are not near-duplicates of past_queries or of an earlier query in the list"""
+        seen = [query_tokens(q) for q in past_queries or []]
+        fresh = []
+        for query in queries:
+            tokens = query_tokens(query)
+            if any(jaccard(tokens, other) >= self.threshold for other in seen):
+                print(f"Skipping duplicate search query '{query}'")
+                self.skipped += 1
+                continue
+            seen.append(tokens)
+            fresh.append(query)
+        return fresh
+
+    # ---------------- global ----------------
+
+    def _signature(self, tokens):
+        hashes = [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big") for t in tokens]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+
+    def _bands(self, tokens):
+        signature = self._signature(tokens)
+        return [
+            (i, hash(tuple(signature[i * self._rows:(i + 1) * self._rows])))
+            for i in range(self.BANDS)
+        ]
+
+    def lookup(self, query):
+        """Stored answers of a near-duplicate query seen in any thread, or None"""
+        if not self.global_enabled:
+            return None
+        tokens = query_tokens(query)
+        if not tokens:
+            return None
+        bands = self._bands(tokens)
+        now = time.time()
+        with self._lock:
+            candidates = set()
+            for band in bands:
+                candidates |= self._buckets.get(band, set())
+            best, best_score = None, 0.0
+            for candidate in candidates:
+                expires_at, other, _, _ = self._entries[candidate]
+                if expires_at < now:
+                    continue
+                score = jaccard(tokens, other)
+                if score >= self.threshold and score > best_score:
+                    best, best_score = candidate, score
+            if best is None:
+                return None
+            self._entries.move_to_end(best)
+            self.reused += 1
+            answers = list(self._entries[best][3])
+        print(f"Reusing answers of '{best}' for search query '{query}'")
+        return answers
+
+    def add(self, query, answers):
+        """Remember the answers of a completed search in the global index"""
+        if not self.global_enabled or not answers:
+            return
+        tokens = query_tokens(query)
+        if not tokens:
+            return
+        bands = self._bands(tokens)
+        with self._lock:
+            self._remove(query)
+            self._entries[query] = (time.time() + self.ttl, tokens, bands, list(answers))
+            for band in bands:
+                self._buckets[band].add(query)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, query):
+        entry = self._entries.pop(query, None)
+        if entry is None:
+            return
+        for band in entry[2]:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(query)
+                if not bucket:
+                    del self._buckets[band]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "global": self.global_enabled,
+                "entries": len(self._entries),
+                "duplicates_skipped": self.skipped,
+                "answers_reused": self.reused,
+            }
@@ -0,0 +1,161 @@
+"""
+Response Cache - Opt-in LLM response cache for deterministic node prompts
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from langchain_core.messages import AIMessage
+
+load_dotenv()
+
+
+def cache_key(identity, messages):
+    """
+    Build a cache key from the model identity (provider, model, temperature)
+    and a hash of the message list.
+    """
+    payload = {
+        "provider": identity.get("provider"),
+        "model": identity.get("model"),
+        "temperature": identity.get("temperature"),
+        "messages": [[m.type, m.content] for m in messages],
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache bounded by total payload bytes, with an optional SQLite backend"""
+
+    def __init__(self, max_bytes=None, path=None):
+        """
+        max_bytes: memory cap for cached responses (LLM_CACHE_MAX_BYTES, default 16 MB)
+        path: SQLite file for persistence (LLM_CACHE_PATH, unset = memory only)
+        """
+        self.max_bytes = max_bytes or int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        self.path = path if path is not None else os.getenv("LLM_CACHE_PATH", "")
+
+        self._entries = OrderedDict()  # key -> (size, value)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path:
+            self._connect()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def reopen(self):
+        """Open a fresh SQLite connection (connections must not cross a fork)"""
+        if self.path:
+            with self._lock:
+                self._connect()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    value = json.loads(row[0])
+                    self._store(key, value, len(row[0]))
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        encoded = json.dumps(value)
+        with self._lock:
+            self._store(key, value, len(encoded))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)",
+                    (key, encoded),
+                )
+                self._db.commit()
+
+    def _store(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[0]
+        self._entries[key] = (size, value)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+class CachedChatModel:
+    """
+    Wraps a chat model so invoke() is served from a ResponseCache.
+    Everything else (with_structured_output, stream, ...) passes straight
+    through to the wrapped model, uncached.
+    """
+
+    def __init__(self, model, cache, identity):
+        self.model = model
+        self.cache = cache
+        self.identity = identity
+
+    def invoke(self, messages, config=None, **kwargs):
+        key = cache_key(self.identity, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return AIMessage(content=cached["content"])
+
+        resp = self.model.invoke(messages, config, **kwargs)
+        if resp is not None and getattr(resp, "content", None):
+            self.cache.set(key, {"content": resp.content})
+        return resp
+
+    async def ainvoke(self, messages, config=None, **kwargs):
+        key = cache_key(self.identity, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return AIMessage(content=cached["content"])
+
+        resp = await self.model.ainvoke(messages, config, **kwargs)
+        if resp is not None and getattr(resp, "content", None):
+            self.cache.set(key, {"content": resp.content})
+        return resp
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
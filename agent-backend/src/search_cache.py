@@ -0,0 +1,190 @@
+"""
+Search Cache - TTL-based search result cache keyed by normalized query
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "the", "in", "on", "at", "for", "to", "of", "with",
+    "my", "our", "me", "we", "i", "is", "are", "be", "by", "from", "about",
+    "what", "which", "some", "any", "please",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_query(query):
+    """
+    Normalize a search query so near-identical phrasings share a cache key:
+    lower-case, strip punctuation/whitespace, drop stopwords and sort tokens.
+    """
+    tokens = _TOKEN_RE.findall((query or "").lower())
+    kept = sorted(set(t for t in tokens if t not in STOPWORDS))
+    # a query made only of stopwords still needs a stable key
+    return " ".join(kept or sorted(set(tokens)))
+
+
+class SearchCache:
+    """In-process LRU tier with an optional SQLite tier; every entry carries its own TTL"""
+
+    def __init__(self, max_entries=None, ttl=None, path=None):
+        """
+        max_entries: LRU capacity (SEARCH_CACHE_SIZE, default 512)
+        ttl: default entry lifetime in seconds (SEARCH_CACHE_TTL, default 86400)
+        path: SQLite file for the on-disk tier (SEARCH_CACHE_PATH, unset = memory only)
+        """
+        self.max_entries = max_entries or int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+        self.ttl = ttl or float(os.getenv("SEARCH_CACHE_TTL", "86400"))
+        self.path = path if path is not None else os.getenv("SEARCH_CACHE_PATH", "")
+
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path:
+            self._connect()
+            self._warm()
+
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def reopen(self):
+        """Open a fresh SQLite connection (connections must not cross a fork)"""
+        if self.path:
+            with self._lock:
+                self._connect()
+
+    def _warm(self):
+        """Load the freshest unexpired disk entries into the LRU tier"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT key, value, expires_at FROM search_cache "
+                "ORDER BY expires_at DESC LIMIT ?",
+                (self.max_entries,),
+            ).fetchall()
+            # oldest first so the freshest entries end up most recently used
+            for key, value, expires_at in reversed(rows):
+                self._entries[key] = (expires_at, json.loads(value))
+        if rows:
+            print(f"✅ Search cache warmed with {len(rows)} entries from {self.path}")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM search_cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row:
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1])
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+class CachedSearchClient:
+    """Drop-in wrapper around TavilyClient that serves repeat queries from a SearchCache"""
+
+    def __init__(self, client, cache=None, async_client=None):
+        self.client = client
+        self.cache = cache or SearchCache()
+        self.async_client = async_client
+
+    def _key(self, query, max_results, kwargs):
+        key = f"{normalize_query(query)}|{max_results}"
+        if kwargs:
+            key += "|" + json.dumps(kwargs, sort_keys=True, default=str)
+        return key
+
+    def _remember(self, key, resp):
+        # never cache failures or empty result sets
+        if resp and resp.get("results"):
+            self.cache.set(key, resp)
+        return resp
+
+    def search(self, query, max_results=3, **kwargs):
+        key = self._key(query, max_results, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        resp = self.client.search(query=query, max_results=max_results, **kwargs)
+        return self._remember(key, resp)
+
+    async def asearch(self, query, max_results=3, **kwargs):
+        key = self._key(query, max_results, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self.async_client is not None:
+            resp = await self.async_client.search(query=query, max_results=max_results, **kwargs)
+        else:
+            resp = await asyncio.to_thread(self.client.search, query=query, max_results=max_results, **kwargs)
+        return self._remember(key, resp)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
@@ -0,0 +1,164 @@
+"""
+Search Executor - Bounded concurrent fan-out for web search queries
+"""
+
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dotenv import load_dotenv
+
+from src import metrics
+
+load_dotenv()
+
+
+class SearchExecutor:
+    """Runs search queries concurrently on a shared, bounded thread pool"""
+
+    def __init__(self, client, max_workers=None, timeout=None, async_client=None, provider="tavily"):
+        """
+        client: any object exposing search(query=..., max_results=...) (e.g. TavilyClient)
+        max_workers: concurrency limit (SEARCH_MAX_CONCURRENCY, default 4)
+        timeout: per-query timeout in seconds (SEARCH_TIMEOUT, default 15)
+        async_client: optional object exposing an async search() (e.g. AsyncTavilyClient)
+        provider: label for the search metrics
+        """
+        self.client = client
+        self.async_client = async_client
+        self.provider = provider
+        self.max_workers = max_workers or int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+        self.max_async = int(os.getenv("SEARCH_MAX_ASYNC_CONCURRENCY", "64"))
+        self.timeout = timeout or float(os.getenv("SEARCH_TIMEOUT", "15"))
+        self._loop = None
+        self._async_limit = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="search",
+        )
+
+    def _record(self, node, started, response=None, error=None):
+        labels = {"node": node or "", "provider": self.provider}
+        metrics.SEARCH_SECONDS.observe(time.perf_counter() - started, **labels)
+        if error is not None:
+            metrics.SEARCH_ERRORS.inc(reason=error, **labels)
+        else:
+            metrics.SEARCH_BYTES.inc(
+                sum(len(c.encode("utf-8")) for c in self.flatten([response])), **labels
+            )
+
+    def _timed_search(self, query, max_results, node):
+        started = time.perf_counter()
+        try:
+            response = self.client.search(query=query, max_results=max_results)
+        except Exception:
+            self._record(node, started, error="error")
+            raise
+        self._record(node, started, response)
+        return response
+
+    def _run_started(self, running, query, max_results, node):
+        # marks when the query left the pool's queue, so its timeout counts
+        # execution time only
+        running.started = time.monotonic()
+        running.set()
+        return self._timed_search(query, max_results, node)
+
+    def search_many(self, queries, max_results=3, node=None):
+        """
+        Search every query concurrently.
+        Returns one response per query in the same order as `queries`;
+        failed or timed-out queries yield None. `node` labels the metrics.
+        The pool is shared by all callers, so a query may wait for a free
+        worker; SEARCH_TIMEOUT applies from the moment it starts running.
+        """
+        jobs = []
+        for q in queries:
+            running = threading.Event()
+            future = self._pool.submit(self._run_started, running, q, max_results, node)
+            # also wakes the waiter if the query never runs (pool shut down)
+            future.add_done_callback(lambda f, running=running: running.set())
+            jobs.append((q, future, running))
+
+        responses = []
+        for q, future, running in jobs:
+            running.wait()
+            started = getattr(running, "started", None)
+            remaining = self.timeout if started is None else started + self.timeout - time.monotonic()
+            try:
+                responses.append(future.result(timeout=max(0.0, remaining)))
+            except FutureTimeoutError:
+                # the query ran past its timeout; its worker finishes in the background
+                metrics.SEARCH_ERRORS.inc(node=node or "", provider=self.provider, reason="timeout")
+                print(f"Search timed out after {self.timeout}s for query '{q}'")
+                responses.append(None)
+            except Exception as e:
+                # Log error but continue with other queries
+                print(f"Error searching for query '{q}': {str(e)}")
+                responses.append(None)
+        return responses
+
+    def search_answers(self, queries, max_results=3):
+        """
+        Search every query concurrently and return the flattened result
+        contents, ordered by query and then by result rank.
+        """
+        return self.flatten(self.search_many(queries, max_results=max_results))
+
+    async def asearch_many(self, queries, max_results=3, node=None):
+        """
+        Async variant of search_many: awaits the client's asearch() or the
+        async client when available (otherwise runs search() in a worker
+        thread), with at most SEARCH_MAX_ASYNC_CONCURRENCY searches in flight
+        across all callers on this event loop.
+        """
+        semaphore = self._semaphore()
+
+        async def _one(q):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    if hasattr(self.client, "asearch"):
+                        call = self.client.asearch(query=q, max_results=max_results)
+                    elif self.async_client is not None:
+                        call = self.async_client.search(query=q, max_results=max_results)
+                    else:
+                        call = asyncio.to_thread(self.client.search, query=q, max_results=max_results)
+                    response = await asyncio.wait_for(call, timeout=self.timeout)
+                    self._record(node, started, response)
+                    return response
+                except asyncio.TimeoutError:
+                    self._record(node, started, error="timeout")
+                    print(f"Search timed out after {self.timeout}s for query '{q}'")
+                except Exception as e:
+                    self._record(node, started, error="error")
+                    print(f"Error searching for query '{q}': {str(e)}")
+                return None
+
+        # gather keeps results in query order
+        return await asyncio.gather(*(_one(q) for q in queries))
+
+    async def asearch_answers(self, queries, max_results=3):
+        return self.flatten(await self.asearch_many(queries, max_results=max_results))
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._async_limit = asyncio.Semaphore(self.max_async)
+        return self._async_limit
+
+    @staticmethod
+    def flatten(responses):
+        """Result contents of search responses, ordered by response and then by rank"""
+        answers = []
+        for resp in responses:
+            if resp and "results" in resp:
+                for r in resp["results"]:
+                    if "content" in r:
+                        answers.append(r["content"])
+        return answers
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,107 @@
+"""
+Speculation - Start a thread's next step early and hand its result to the node that needs it
+"""
+
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def thread_of(config):
+    """thread_id of a node's RunnableConfig, or None"""
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+class Speculator:
+    """
+    Holds at most one speculative result per thread: a Future (sync nodes)
+    or an asyncio Task (async nodes). The producing node starts it, the
+    consuming node takes it. Results nobody took expire after
+    SPECULATIVE_TTL seconds.
+    """
+
+    def __init__(self, workers=None, ttl=None):
+        """
+        workers: threads for speculative work in sync nodes (SPECULATIVE_WORKERS, default 4)
+        ttl: seconds an untaken result is kept (SPECULATIVE_TTL, default 600)
+        """
+        self.ttl = ttl or float(os.getenv("SPECULATIVE_TTL", "600"))
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("SPECULATIVE_WORKERS", "4")),
+            thread_name_prefix="speculate",
+        )
+        self._pending = {}  # thread_id -> (started_at, Future | Task)
+        self._lock = threading.Lock()
+        self.started = 0
+        self.used = 0
+
+    def _put(self, thread_id, work):
+        now = time.time()
+        with self._lock:
+            for tid, (started_at, stale) in list(self._pending.items()):
+                if now - started_at > self.ttl:
+                    stale.cancel()
+                    del self._pending[tid]
+            previous = self._pending.pop(thread_id, None)
+            if previous is not None:
+                previous[1].cancel()
+            self._pending[thread_id] = (now, work)
+            self.started += 1
+
+    def start(self, thread_id, fn, *args):
+        """Run fn(*args) on the speculation pool for `thread_id`"""
+        if thread_id is not None:
+            self._put(thread_id, self._pool.submit(fn, *args))
+
+    def astart(self, thread_id, coro):
+        """Schedule `coro` on the running event loop for `thread_id`"""
+        if thread_id is None:
+            coro.close()
+            return
+        self._put(thread_id, asyncio.ensure_future(coro))
+
+    def _take(self, thread_id, kind):
+        with self._lock:
+            entry = self._pending.get(thread_id)
+            if entry is None or not isinstance(entry[1], kind):
+                return None
+            del self._pending[thread_id]
+        return entry[1]
+
+    def take(self, thread_id):
+        """
+        Wait for and return the speculative result for `thread_id`, or None
+        if there is none or it failed (the caller then does the work itself).
+        """
+        future = self._take(thread_id, Future)
+        if future is None:
+            return None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Speculative work failed for thread {thread_id}: {str(e)}")
+            return None
+        self.used += 1
+        return result
+
+    async def atake(self, thread_id):
+        """Async variant of take()"""
+        task = self._take(thread_id, asyncio.Future)
+        if task is None:
+            return None
+        try:
+            result = await task
+        except Exception as e:
+            print(f"Speculative work failed for thread {thread_id}: {str(e)}")
+            return None
+        self.used += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {"started": self.started, "used": self.used, "pending": len(self._pending)}
@@ -0,0 +1,159 @@
+"""
+Stream Protocol - Delta encoding of graph state for NDJSON streams
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class StateDeltaEncoder:
+    """
+    Turns successive full state values into small events that only carry
+    what changed since the previous event:
+
+      {"type": "snapshot", "values": {...}}              full state
+      {"type": "delta", "set": {...}, "append": {...}}   changed keys
+
+    List keys that only grew (queries, answers) are sent as their new tail
+    under "append"; every other changed key is sent whole under "set".
+    """
+
+    def __init__(self, snapshot_every=None):
+        """
+        snapshot_every: send a full snapshot every N state events
+        (STREAM_SNAPSHOT_EVERY, default 0 = only the first event)
+        """
+        if snapshot_every is None:
+            snapshot_every = int(os.getenv("STREAM_SNAPSHOT_EVERY", "0"))
+        self.snapshot_every = snapshot_every
+        self._previous = None
+        self._events = 0
+
+    def encode(self, values):
+        """
+        Return the event for `values`, or None if nothing changed.
+        """
+        # nodes extend state lists in place, so keep our own copy of them
+        values = {
+            k: list(v) if isinstance(v, list) else v
+            for k, v in (values or {}).items()
+        }
+        previous = self._previous
+        self._previous = values
+        self._events += 1
+
+        if previous is None or (
+            self.snapshot_every and self._events % self.snapshot_every == 0
+        ):
+            return {"type": "snapshot", "values": values}
+
+        changed = {}
+        appended = {}
+        for key, value in values.items():
+            old = previous.get(key)
+            if (
+                isinstance(value, list)
+                and isinstance(old, list)
+                and len(value) >= len(old)
+                and value[:len(old)] == old
+            ):
+                if len(value) > len(old):
+                    appended[key] = value[len(old):]
+            elif key not in previous or old != value:
+                changed[key] = value
+
+        if not changed and not appended:
+            return None
+
+        event = {"type": "delta"}
+        if changed:
+            event["set"] = changed
+        if appended:
+            event["append"] = appended
+        return event
+
+
+def chunk_text(chunk):
+    """
+    Extract plain text from a streamed message chunk
+    (content may be a string or a list of content blocks).
+    """
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content or []
+    )
+
+
+class GraphEventStream:
+    """
+    Translates the (mode, data) pairs of graph.stream/astream with
+    stream_mode=STREAM_MODES into NDJSON events:
+      - token events for chat model chunks from `streamed_nodes`
+      - snapshot/delta events (StateDeltaEncoder) after every node
+      - a status event after every graph run (see status())
+    All events share one increasing "seq".
+    """
+
+    STREAM_MODES = ["messages", "updates", "values"]
+
+    def __init__(self, thread_id, streamed_nodes, snapshot_every=None, resolve=None):
+        """
+        resolve: optional function turning stored state values into what
+        clients see (e.g. answer refs into answer texts)
+        """
+        self.thread_id = thread_id
+        self.streamed_nodes = streamed_nodes
+        self.resolve = resolve
+        self.encoder = StateDeltaEncoder(snapshot_every)
+        self.seq = 0
+        self.lnode = None
+
+    def _next(self, event):
+        event["seq"] = self.seq
+        self.seq += 1
+        return event
+
+    def translate(self, mode, data):
+        """Return the event for one streamed item, or None"""
+        if mode == "updates":
+            # node that produced the values event that follows
+            self.lnode = next(iter(data), self.lnode)
+            return None
+
+        if mode == "values":
+            event = self.encoder.encode(self.resolve(data) if self.resolve else data)
+            if event is None:
+                return None
+            event.update({"thread_id": self.thread_id, "node": self.lnode})
+            return self._next(event)
+
+        chunk, metadata = data
+        node = metadata.get("langgraph_node")
+        text = chunk_text(chunk)
+        if node in self.streamed_nodes and text:
+            return self._next({
+                "type": "token",
+                "thread_id": self.thread_id,
+                "node": node,
+                "chunk": text,
+            })
+        return None
+
+    def status(self, state, thread_ts):
+        """Status event for the thread after a graph run (state may be None)"""
+        values = getattr(state, "values", None) or {}
+        return self._next({
+            "type": "state",
+            "thread_id": self.thread_id,
+            "thread_ts": thread_ts,
+            "lnode": self.lnode,
+            "nnode": getattr(state, "next", None),
+            "revision_number": values.get("revision_number"),
+            "count": values.get("count"),
+        })
+
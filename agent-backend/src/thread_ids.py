@@ -0,0 +1,45 @@
+"""
+Thread IDs - Globally unique, time-sortable thread identifiers (ULID)
+"""
+
+import os
+import time
+
+# Crockford base32 (no I, L, O, U) keeps IDs URL-safe and sortable as strings
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_LENGTH = 26
+
+
+def _encode(value):
+    chars = []
+    for _ in range(_LENGTH):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def new_thread_id():
+    """
+    Return a new ULID: a 48-bit millisecond timestamp followed by 80 random bits.
+    IDs sort lexicographically by creation time and need no shared counter or
+    lock, so they never collide across threads, workers or replicas.
+    """
+    millis = int(time.time() * 1000)
+    randomness = int.from_bytes(os.urandom(10), "big")
+    return _encode((millis << 80) | randomness)
+
+
+def thread_id_floor(timestamp):
+    """
+    Smallest thread ID that can be created at or after `timestamp` (seconds).
+    Lets checkpoint stores range-scan recent threads: thread_id >= floor.
+    """
+    return _encode(int(timestamp * 1000) << 80)
+
+
+def thread_id_timestamp(thread_id):
+    """Creation time (seconds since epoch) encoded in a thread ID"""
+    value = 0
+    for char in thread_id.upper():
+        value = (value << 5) | _ALPHABET.index(char)
+    return (value >> 80) / 1000.0
@@ -1,13 +1,29 @@
 """
 Test script for agent-backend API endpoints
 Run this after starting the Flask server: python app.py
+
+    python test_endpoints.py                          # sequential happy path
+    python test_endpoints.py --load --users 20 --rate 2 --duration 60
+    python test_endpoints.py --load --scenario stream --base-url http://staging:8000
 """
 
+import os
+import argparse
+import random
+import threading
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:5000")
 
-BASE_URL = "http://localhost:5000"
+LOAD_TASKS = [
+    "Plan a 5-day trip to Paris for a couple",
+    "Plan a 3-day food trip to Lisbon",
+    "Plan a week in Japan in October, I want to make friends",
+    "Plan a weekend hiking trip near Vienna on a budget",
+]
 
 def test_health():
     """Test health endpoint"""
@@ -126,6 +142,232 @@ def test_error_cases():
     print(f"   Status: {response.status_code} (expected 400)")
     print(f"   Error: {response.json().get('error')}")
 
+# ------------------------------------------------------
+# Load mode: concurrent virtual users
+# ------------------------------------------------------
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+class LoadStats:
+    """Thread-safe per-endpoint latency, TTFB and error counters"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}  # endpoint -> [seconds]
+        self.ttfb = {}       # endpoint -> [seconds], NDJSON streams only
+        self.errors = {}     # endpoint -> {reason: count}
+        self.sessions = 0
+        self.failed_sessions = 0
+        self.skipped = 0
+
+    def record(self, endpoint, latency, error=None, ttfb=None):
+        with self.lock:
+            self.latencies.setdefault(endpoint, []).append(latency)
+            if ttfb is not None:
+                self.ttfb.setdefault(endpoint, []).append(ttfb)
+            if error is not None:
+                reasons = self.errors.setdefault(endpoint, {})
+                reasons[error] = reasons.get(error, 0) + 1
+
+    def session_done(self, ok):
+        with self.lock:
+            self.sessions += 1
+            if not ok:
+                self.failed_sessions += 1
+
+    def report(self, elapsed):
+        def summary(values):
+            return {
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+            }
+
+        with self.lock:
+            endpoints = {}
+            for endpoint, values in sorted(self.latencies.items()):
+                errors = sum(self.errors.get(endpoint, {}).values())
+                endpoints[endpoint] = {
+                    "requests": len(values),
+                    "throughput_rps": round(len(values) / elapsed, 2),
+                    "error_rate": round(errors / len(values), 4),
+                    "errors": dict(self.errors.get(endpoint, {})),
+                    **summary(values),
+                }
+                if endpoint in self.ttfb:
+                    endpoints[endpoint]["ttfb"] = summary(self.ttfb[endpoint])
+            return {
+                "elapsed_s": round(elapsed, 2),
+                "sessions": self.sessions,
+                "failed_sessions": self.failed_sessions,
+                "skipped_arrivals": self.skipped,
+                "sessions_per_s": round(self.sessions / elapsed, 3),
+                "endpoints": endpoints,
+            }
+
+
+class VirtualUser:
+    """One simulated client with its own keep-alive session"""
+
+    def __init__(self, stats, think_time, timeout, max_revisions):
+        self.http = requests.Session()
+        self.stats = stats
+        self.think_time = think_time
+        self.timeout = timeout
+        self.max_revisions = max_revisions
+
+    def think(self):
+        if self.think_time > 0:
+            # exponential think time around the configured mean
+            time.sleep(random.expovariate(1.0 / self.think_time))
+
+    def post(self, endpoint, payload):
+        """POST a JSON step endpoint; returns the decoded body or None on failure"""
+        started = time.perf_counter()
+        try:
+            response = self.http.post(f"{BASE_URL}{endpoint}", json=payload, timeout=self.timeout)
+            latency = time.perf_counter() - started
+            if response.status_code != 200:
+                self.stats.record(endpoint, latency, f"http_{response.status_code}")
+                return None
+            body = response.json()
+        except requests.exceptions.Timeout:
+            self.stats.record(endpoint, time.perf_counter() - started, "timeout")
+            return None
+        except Exception as e:
+            self.stats.record(endpoint, time.perf_counter() - started, type(e).__name__)
+            return None
+        self.stats.record(endpoint, latency)
+        return body
+
+    def stream(self, endpoint, payload):
+        """POST an NDJSON endpoint and read it to the end; records time to first byte"""
+        started = time.perf_counter()
+        ttfb = None
+        error = None
+        try:
+            with self.http.post(f"{BASE_URL}{endpoint}", json=payload, stream=True, timeout=self.timeout) as response:
+                if response.status_code != 200:
+                    error = f"http_{response.status_code}"
+                else:
+                    for line in response.iter_lines():
+                        if ttfb is None:
+                            ttfb = time.perf_counter() - started
+                        if line and "error" in json.loads(line):
+                            error = "stream_error"
+        except requests.exceptions.Timeout:
+            error = "timeout"
+        except Exception as e:
+            error = type(e).__name__
+        self.stats.record(endpoint, time.perf_counter() - started, error, ttfb)
+        return error is None
+
+    def steps_session(self, task):
+        """plan -> research -> generate -> critique through the step endpoints"""
+        result = self.post("/api/plan", {"task": task})
+        if not result:
+            return False
+        thread_id, plan = result.get("thread_id"), result.get("plan", "")
+        self.think()
+        if not self.post("/api/research", {"plan": plan, "thread_id": thread_id}):
+            return False
+        self.think()
+        result = self.post("/api/generate", {"task": task, "plan": plan, "thread_id": thread_id})
+        if not result:
+            return False
+        self.think()
+        return self.post("/api/critique", {"draft": result.get("draft", ""), "thread_id": thread_id}) is not None
+
+    def stream_session(self, task):
+        return self.stream("/api/stream-run", {"task": task, "start": True, "max_iterations": self.max_revisions})
+
+    def run(self, scenario):
+        task = random.choice(LOAD_TASKS)
+        if scenario == "mixed":
+            scenario = random.choice(("steps", "stream"))
+        ok = self.steps_session(task) if scenario == "steps" else self.stream_session(task)
+        self.stats.session_done(ok)
+
+
+def run_load(args):
+    """
+    Drive the server with up to `users` concurrent virtual users for
+    `duration` seconds. With --rate, sessions arrive as a Poisson process
+    at that many per second (open model; arrivals queue when all users are
+    busy); without it every user starts a new session as soon as its last
+    one ends (closed model).
+    """
+    stats = LoadStats()
+    local = threading.local()
+    stop_at = time.monotonic() + args.duration
+
+    def session():
+        if time.monotonic() >= stop_at:
+            # arrived while every user was busy and the test is over
+            with stats.lock:
+                stats.skipped += 1
+            return
+        if not hasattr(local, "user"):
+            local.user = VirtualUser(stats, args.think_time, args.timeout, args.max_revisions)
+        local.user.run(args.scenario)
+
+    print(f"Load test against {BASE_URL}: {args.users} users, scenario={args.scenario}, "
+          f"rate={args.rate or 'closed loop'}, think={args.think_time}s, duration={args.duration}s")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        if args.rate > 0:
+            while time.monotonic() < stop_at:
+                pool.submit(session)
+                time.sleep(random.expovariate(args.rate))
+        else:
+            def loop():
+                while time.monotonic() < stop_at:
+                    session()
+            for _ in range(args.users):
+                pool.submit(loop)
+    elapsed = time.monotonic() - started
+
+    report = stats.report(elapsed)
+    print(f"\nSessions: {report['sessions']} ({report['failed_sessions']} failed), "
+          f"{report['sessions_per_s']} sessions/s over {report['elapsed_s']}s")
+    if report["skipped_arrivals"]:
+        print(f"⚠️  {report['skipped_arrivals']} arrivals never started: all users were busy (raise --users)")
+    print(f"{'endpoint':<20}{'reqs':>7}{'rps':>8}{'err%':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ttfb p95':>10}")
+    for endpoint, e in report["endpoints"].items():
+        ttfb = e.get("ttfb", {}).get("p95_ms", "")
+        print(f"{endpoint:<20}{e['requests']:>7}{e['throughput_rps']:>8}{e['error_rate'] * 100:>7.1f}"
+              f"{e['p50_ms']:>10}{e['p95_ms']:>10}{e['p99_ms']:>10}{ttfb:>10}")
+        if e["errors"]:
+            print(f"{'':<20}errors: {e['errors']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"settings": vars(args), "base_url": BASE_URL, **report}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Agent backend API tests and load generator")
+    parser.add_argument("--base-url", default=BASE_URL, help=f"server to test (BASE_URL, default {BASE_URL})")
+    parser.add_argument("--load", action="store_true", help="run the concurrent load generator instead of the test suite")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users (default 10)")
+    parser.add_argument("--rate", type=float, default=0, help="new sessions per second (default 0 = closed loop)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between a user's steps (default 1)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to generate load (default 60)")
+    parser.add_argument("--scenario", choices=("steps", "stream", "mixed"), default="mixed",
+                        help="step endpoints, /api/stream-run, or both (default mixed)")
+    parser.add_argument("--max-revisions", type=int, default=2, help="max_iterations sent to /api/stream-run")
+    parser.add_argument("--timeout", type=float, default=300, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="write the load report as JSON")
+    return parser.parse_args()
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -182,10 +424,15 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
+    args = parse_args()
+    BASE_URL = args.base_url.rstrip("/")
     try:
-        main()
+        if args.load:
+            run_load(args)
+        else:
+            main()
     except requests.exceptions.ConnectionError:
-        print("\n❌ Connection Error: Make sure the Flask server is running on http://localhost:5000")
+        print(f"\n❌ Connection Error: Make sure the Flask server is running on {BASE_URL}")
         print("   Start it with: python app.py")
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
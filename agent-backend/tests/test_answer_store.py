@@ -0,0 +1,54 @@
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.answer_store import AnswerStore
+from src.checkpointer import CheckpointRetention
+
+
+def test_memory_store_is_capped():
+    store = AnswerStore(path="", max_entries=3)
+    refs = store.put([f"answer {i}" for i in range(5)], "t1")
+
+    assert store.stats()["entries"] == 3
+    assert store.get(refs[0]) is None
+    assert store.get(refs[4]) == "answer 4"
+
+
+def test_release_keeps_answers_shared_with_live_threads():
+    store = AnswerStore(path="")
+    shared, only_t1 = store.put(["shared", "only t1"], "t1")
+    store.put(["shared"], "t2")
+
+    assert store.release("t1") == 1
+    assert store.get(only_t1) is None
+    assert store.get(shared) == "shared"
+
+    assert store.release("t2") == 1
+    assert store.stats()["entries"] == 0
+
+
+def test_sqlite_release_deletes_orphaned_rows(tmp_path):
+    path = str(tmp_path / "answers.db")
+    store = AnswerStore(path=path)
+    shared, only_t1 = store.put(["shared", "only t1"], "t1")
+    store.put(["shared"], "t2")
+    store.release("t1")
+
+    # a fresh process sees only what is on disk
+    reopened = AnswerStore(path=path)
+    assert reopened.get(only_t1) is None
+    assert reopened.get(shared) == "shared"
+    assert reopened._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0] == 1
+
+
+def test_retention_sweep_releases_answers():
+    saver = MemorySaver()
+    store = AnswerStore(path="")
+    retention = CheckpointRetention(saver, backend="memory", ttl=60)
+    retention.on_delete.append(store.release)
+
+    store.put(["a", "b"], "t1")
+    retention.touch("t1")
+    retention._last_seen["t1"] -= 120
+
+    assert retention.sweep() == 1
+    assert store.stats()["entries"] == 0
@@ -0,0 +1,39 @@
+import asyncio
+
+from src.model_router import RoutingChatModel
+
+
+class SleepyModel:
+    def __init__(self, name, latency):
+        self.name = name
+        self.latency = latency
+        self.calls = 0
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return self.name
+
+
+def test_slow_provider_drops_in_ranking_after_losing_hedges():
+    slow = SleepyModel("slow", 0.5)
+    fast = SleepyModel("fast", 0.01)
+    router = RoutingChatModel([("slow", slow), ("fast", fast)], hedge_after_ms=50)
+
+    async def run():
+        return [await router.ainvoke("hi") for _ in range(4)]
+
+    assert asyncio.run(run()) == ["fast"] * 4
+    # the first call hedged and cancelled the slow provider; later calls go
+    # straight to the fast one
+    assert slow.calls == 1
+    assert router.stats()["slow"]["p50"] >= 0.05
+    assert [name for name, _ in router.ranked()] == ["fast", "slow"]
+
+
+def test_untried_provider_does_not_outrank_a_fast_one():
+    router = RoutingChatModel(
+        [("untried", SleepyModel("untried", 0)), ("fast", SleepyModel("fast", 0))], hedge_after_ms=0
+    )
+    router._stats["fast"].record(0.1)
+    assert [name for name, _ in router.ranked()] == ["fast", "untried"]
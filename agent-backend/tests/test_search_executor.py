@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.search_executor import SearchExecutor
+
+
+class SlowClient:
+    def __init__(self, latency, slow_queries=()):
+        self.latency = latency
+        self.slow_queries = set(slow_queries)
+
+    def search(self, query, max_results=3):
+        time.sleep(self.latency * (10 if query in self.slow_queries else 1))
+        return {"results": [{"content": query}]}
+
+
+def test_saturated_pool_does_not_time_out_queued_queries():
+    # 6 callers x 3 queries on 2 workers: most queries wait in the queue for
+    # far longer than the timeout, but each one runs well within it
+    executor = SearchExecutor(SlowClient(0.1), max_workers=2, timeout=0.3)
+    try:
+        with ThreadPoolExecutor(max_workers=6) as callers:
+            batches = list(callers.map(
+                lambda i: executor.search_many([f"q{i}-{j}" for j in range(3)]), range(6)
+            ))
+    finally:
+        executor.shutdown()
+
+    assert all(r is not None for batch in batches for r in batch)
+    assert [r["results"][0]["content"] for r in batches[0]] == ["q0-0", "q0-1", "q0-2"]
+
+
+def test_query_running_past_timeout_is_dropped():
+    executor = SearchExecutor(SlowClient(0.05, slow_queries={"slow"}), max_workers=2, timeout=0.2)
+    try:
+        started = time.monotonic()
+        responses = executor.search_many(["fast", "slow", "also fast"])
+        elapsed = time.monotonic() - started
+    finally:
+        executor.shutdown()
+
+    assert responses[0] is not None and responses[2] is not None
+    assert responses[1] is None
+    assert elapsed < 0.45
@@ -34,6 +34,7 @@ Utilize the information below as needed:
 PLANNER_CRITIQUE_PROMPT = """Your duty is to criticize the planning done by the vacation planner.
 In your response include if you agree with options presented by the planner, if not then give detailed suggestions on what should be changed.
 You can also suggest some other destination that should be checked out.
+End your response with a final line "VERDICT: APPROVED" if the plan needs no further changes, otherwise "VERDICT: REVISE".
 """
 
 PLANNER_CRITIQUE_ASSISTANT_PROMPT = """You are a assistant charged with providing information that can be used to make any requested revisions.
@@ -0,0 +1,109 @@
+"""
+Background worker for queued plans (POST /api/jobs).
+
+    python worker.py
+
+Runs outside the web process: each worker thread claims a job from the
+shared JobQueue, runs the full graph for it and records progress after
+every node. Start several worker processes to scale out; per-tenant caps
+are enforced by the queue across all of them. Use a shared checkpointer
+(CHECKPOINTER=sqlite/postgres/redis) so the web process can read the
+resulting threads through /api/get-state.
+"""
+
+import os
+import signal
+import socket
+import threading
+import traceback
+from dotenv import load_dotenv
+
+from src.builder import builder
+from src.agent_state import initial_state
+from src.job_queue import JobQueue
+
+load_dotenv()
+
+_stopping = threading.Event()
+
+
+def run_job(graph, agent_builder, queue, job):
+    thread_id = job["id"]
+    config = {"configurable": {"thread_id": thread_id}}
+    payload = initial_state(job["task"], job["max_revisions"])
+    revision = 0
+
+    for update in graph.stream(payload, config=config, stream_mode="updates"):
+        for node, output in update.items():
+            revision = (output or {}).get("revision_number", revision)
+            queue.progress(job["id"], {"node": node, "revision_number": revision})
+
+    agent_builder.retention.touch(thread_id)
+    values = graph.get_state(config).values or {}
+    return {
+        "thread_id": thread_id,
+        "plan": values.get("plan", ""),
+        "draft": values.get("draft", ""),
+        "critique": values.get("critique", ""),
+        "revision_number": values.get("revision_number"),
+    }
+
+
+def work(name, graph, agent_builder, queue, poll_interval):
+    while not _stopping.is_set():
+        job = queue.claim(name)
+        if job is None:
+            _stopping.wait(poll_interval)
+            continue
+
+        print(f">> {name} running job {job['id']} ({job['tenant']})")
+        try:
+            queue.complete(job["id"], run_job(graph, agent_builder, queue, job))
+            print(f">> {name} finished job {job['id']}")
+        except Exception as e:
+            traceback.print_exc()
+            queue.fail(job["id"], e)
+
+
+def main():
+    concurrency = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+    poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+    agent_builder = builder()
+    graph = agent_builder.build_graph()
+    agent_builder.retention.start()
+    queue = JobQueue()
+
+    # finish running jobs on SIGTERM/SIGINT, but stop claiming new ones
+    def _stop(signum, frame):
+        print(">> worker stopping after current jobs")
+        _stopping.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    threads = [
+        threading.Thread(
+            target=work,
+            args=(f"{prefix}:{i}", graph, agent_builder, queue, poll_interval),
+            name=f"job-worker-{i}",
+        )
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    print(f"✅ Job worker started with {concurrency} thread(s) on {queue.path}")
+
+    # requeue jobs abandoned by crashed workers
+    while not _stopping.wait(queue.stale_after / 2):
+        requeued = queue.requeue_stale()
+        if requeued:
+            print(f"Requeued {requeued} stale job(s)")
+
+    for t in threads:
+        t.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production serving.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app enabled (see gunicorn.conf.py) this module is imported once
+in the gunicorn master, so the compiled graph and model clients are built a
+single time and shared with every worker via fork. With STARTUP_MODE=lazy or
+background preloading is off by default: workers import in well under a
+second and build their own graph on first use or in a warm-up thread.
+"""
+
+from app import app, begin_drain, on_worker_start  # noqa: F401
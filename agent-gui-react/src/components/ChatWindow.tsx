@@ -1,11 +1,20 @@
 import React, { useState } from 'react';
-import { planVacation, researchPlan, generateDraft, critiqueDraft } from '../services/agentService';
+import { applyStreamEvent, streamRun } from '../services/agentService';
+import { AgentState, StreamEvent } from '../types';
 
 interface Message {
     sender: 'User' | 'Agent';
     content: string;
+    // set while the message is being filled token by token from a node
+    streamNode?: string;
 }
 
+const NODE_LABELS: Record<string, string> = {
+    planner: '📋 Plan',
+    generate: '✍️ Draft',
+    reflect: '💭 Critique',
+};
+
 const ChatWindow: React.FC = () => {
     const [messages, setMessages] = useState<Message[]>([]);
     const [input, setInput] = useState('');
@@ -16,6 +25,19 @@ const ChatWindow: React.FC = () => {
         setMessages((prevMessages) => [...prevMessages, newMessage]);
     };
 
+    // Append a streamed token to the live message for its node,
+    // starting a new message whenever the streaming node changes.
+    const appendToken = (node: string, chunk: string) => {
+        setMessages((prevMessages) => {
+            const last = prevMessages[prevMessages.length - 1];
+            if (last && last.streamNode === node) {
+                return [...prevMessages.slice(0, -1), { ...last, content: last.content + chunk }];
+            }
+            const label = NODE_LABELS[node] || node;
+            return [...prevMessages, { sender: 'Agent', content: `${label}: ${chunk}`, streamNode: node }];
+        });
+    };
+
     const handleSendMessage = async () => {
         if (!input.trim()) return;
 
@@ -26,32 +48,25 @@ const ChatWindow: React.FC = () => {
         setLoading(true);
 
         try {
-            // Step 1: Plan
             displayMessage('Planning your vacation...');
-            const planResult = await planVacation(currentInput);
-            const threadId = planResult.thread_id;
-            const plan = planResult.plan || '';
-            displayMessage(`📋 Plan: ${plan || 'Plan generated'}`);
-            
-            // Step 2: Research Plan
-            displayMessage('Researching plan...');
-            const researchResult = await researchPlan(plan, threadId);
-            const queries = researchResult.queries || [];
-            const answers = researchResult.answers || [];
-            displayMessage(`🔍 Research Queries: ${queries.length > 0 ? queries.join(', ') : 'No queries'}`);
-            displayMessage(`📚 Answers: ${answers.length > 0 ? answers.join(', ') : 'No answers'}`);
-            
-            // Step 3: Generate Draft
-            displayMessage('Generating draft...');
-            const draftResult = await generateDraft(currentInput, plan, threadId);
-            const draft = draftResult.draft || '';
-            displayMessage(`✍️ Draft: ${draft || 'Draft generated'}`);
-            
-            // Step 4: Critique
-            displayMessage('Critiquing draft...');
-            const critiqueResult = await critiqueDraft(draft, threadId);
-            displayMessage(`💭 Critique: ${critiqueResult.critique || 'Critique generated'}`);
-            displayMessage(`✅ Process completed!`);
+            const streamErrors: string[] = [];
+            let agentState: Partial<AgentState> = {};
+
+            await streamRun(currentInput, (event: StreamEvent) => {
+                agentState = applyStreamEvent(agentState, event);
+                if ('error' in event) {
+                    streamErrors.push(event.error);
+                } else if (event.type === 'token') {
+                    appendToken(event.node, event.chunk);
+                } else if (event.type === 'delta' && event.append?.queries) {
+                    displayMessage(`🔍 Research Queries: ${event.append.queries.join(', ')}`);
+                }
+            });
+
+            if (streamErrors.length > 0) {
+                throw new Error(streamErrors[0]);
+            }
+            displayMessage(`✅ Process completed after ${agentState.revision_number || 0} revision(s)!`);
                 
         } catch (error: unknown) {
             const errorMessage = error instanceof Error ? error.message : 'Unknown error occurred';
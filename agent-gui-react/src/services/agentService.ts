@@ -1,4 +1,5 @@
 import axios, { AxiosError } from 'axios';
+import { AgentState, RunEvent, StreamEvent } from '../types';
 
 const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:5000';
 
@@ -68,4 +69,120 @@ export const critiqueDraft = async (draft: string, threadId?: string) => {
 export const fetchResearchData = async (plan: string, threadId?: string) => {
     // maps to the backend research endpoint
     return researchPlan(plan, threadId);
-};
\ No newline at end of file
+};
+
+export interface StreamRunOptions {
+    start?: boolean;
+    stopAfter?: string[];
+    maxIterations?: number;
+}
+
+// POST a JSON body and hand every NDJSON line of the response to onEvent as it arrives.
+// Uses fetch because axios does not expose the response body as a stream in the browser.
+const postNdjson = async <T>(
+    path: string,
+    body: unknown,
+    onEvent: (event: T) => void
+): Promise<void> => {
+    let response: Response;
+    try {
+        response = await fetch(`${API_BASE_URL}${path}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body),
+        });
+    } catch (error) {
+        throw new Error(`Network Error: Cannot connect to server at ${API_BASE_URL}. Make sure the backend server is running.`);
+    }
+
+    if (!response.ok || !response.body) {
+        let message = `Server error (${response.status}): ${response.statusText}`;
+        try {
+            const data = await response.json();
+            message = data.error || data.message || message;
+        } catch {
+            // body was not JSON; keep the status message
+        }
+        throw new Error(message);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    const emitLines = (flush: boolean) => {
+        const lines = buffer.split('\n');
+        buffer = flush ? '' : lines.pop() || '';
+        for (const line of lines) {
+            if (line.trim()) {
+                onEvent(JSON.parse(line) as T);
+            }
+        }
+    };
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        emitLines(false);
+    }
+    buffer += decoder.decode();
+    emitLines(true);
+};
+
+// POST /api/stream-run: token, snapshot/delta and state events.
+export const streamRun = async (
+    task: string | { thread_id: string; thread_ts?: string; task?: string },
+    onEvent: (event: StreamEvent) => void,
+    options: StreamRunOptions = {}
+): Promise<void> =>
+    postNdjson<StreamEvent>(
+        '/api/stream-run',
+        {
+            task,
+            start: options.start ?? true,
+            stop_after: options.stopAfter ?? [],
+            max_iterations: options.maxIterations ?? 1,
+        },
+        onEvent
+    );
+
+// POST /api/run: the server runs the whole pipeline once and streams each
+// node's result over the same connection, so nothing is re-uploaded between steps.
+export const runPipeline = async (
+    task: string,
+    onEvent: (event: RunEvent) => void,
+    maxRevisions?: number
+): Promise<void> =>
+    postNdjson<RunEvent>(
+        '/api/run',
+        maxRevisions === undefined ? { task } : { task, max_revisions: maxRevisions },
+        onEvent
+    );
+
+// Rebuild agent state from the snapshot/delta events of /api/stream-run.
+// Snapshots replace the state; deltas overwrite `set` keys and extend `append` lists.
+export const applyStreamEvent = (
+    state: Partial<AgentState>,
+    event: StreamEvent
+): Partial<AgentState> => {
+    if ('error' in event) {
+        return state;
+    }
+    if (event.type === 'snapshot') {
+        return { ...event.values };
+    }
+    if (event.type !== 'delta') {
+        return state;
+    }
+
+    const next: Partial<AgentState> = { ...state, ...(event.set || {}) };
+    const appended = event.append || {};
+    if (appended.queries) {
+        next.queries = [...(next.queries || []), ...appended.queries];
+    }
+    if (appended.answers) {
+        next.answers = [...(next.answers || []), ...appended.answers];
+    }
+    return next;
+};
@@ -7,6 +7,7 @@ export interface AgentState {
     critique: string;
     revision_number: number;
     max_revisions: number;
+    draft_similarity?: number;
 }
 
 export interface QueryResult {
@@ -23,4 +24,74 @@ export interface PlanResponse {
 
 export interface CritiqueResponse {
     critique: string;
-}
\ No newline at end of file
+}
+
+export interface StreamTokenEvent {
+    type: 'token';
+    thread_id: string;
+    node: string;
+    chunk: string;
+    seq: number;
+}
+
+export interface StreamSnapshotEvent {
+    type: 'snapshot';
+    thread_id: string;
+    node: string | null;
+    seq: number;
+    values: Partial<AgentState>;
+}
+
+export interface StreamDeltaEvent {
+    type: 'delta';
+    thread_id: string;
+    node: string | null;
+    seq: number;
+    // keys replaced wholesale
+    set?: Partial<AgentState>;
+    // list keys that only grew: new items to append
+    append?: Partial<Pick<AgentState, 'queries' | 'answers'>>;
+}
+
+export interface StreamStateEvent {
+    type: 'state';
+    thread_id: string;
+    thread_ts?: string;
+    lnode: string | null;
+    nnode: string[] | null;
+    revision_number: number | null;
+    count: number | null;
+    seq: number;
+}
+
+export interface StreamErrorEvent {
+    type?: undefined;
+    error: string;
+}
+
+export type StreamEvent =
+    | StreamTokenEvent
+    | StreamSnapshotEvent
+    | StreamDeltaEvent
+    | StreamStateEvent
+    | StreamErrorEvent;
+
+// events of POST /api/run (one per finished node, then done)
+export interface RunNodeEvent {
+    type: 'node';
+    thread_id: string;
+    node: string;
+    // the node's output; list keys only carry items added by this node
+    output: Partial<AgentState>;
+    seq: number;
+}
+
+export interface RunDoneEvent {
+    type: 'done';
+    thread_id: string;
+    draft: string;
+    revision_number: number | null;
+    seq: number;
+}
+
+export type RunEvent = RunNodeEvent | RunDoneEvent | StreamErrorEvent;